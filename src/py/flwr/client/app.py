@@ -17,16 +17,15 @@
 import argparse
 import sys
 import time
+from functools import lru_cache, partial
 from logging import DEBUG, ERROR, INFO, WARN
 from pathlib import Path
-from typing import Callable, ContextManager, Optional, Tuple, Type, Union
-
-from grpc import RpcError
+from typing import Callable, ContextManager, Dict, Optional, Tuple, Type, Union
 
 from flwr.client.client import Client
 from flwr.client.client_app import ClientApp, LoadClientAppError
 from flwr.client.typing import ClientFn
-from flwr.common import GRPC_MAX_MESSAGE_LENGTH, EventType, Message, event
+from flwr.common import GRPC_MAX_MESSAGE_LENGTH, Context, EventType, Message, event
 from flwr.common.address import parse_address
 from flwr.common.constant import (
     MISSING_EXTRA_REST,
@@ -36,17 +35,24 @@ from flwr.common.constant import (
     TRANSPORT_TYPES,
 )
 from flwr.common.exit_handlers import register_exit_handlers
+from flwr.common.grpc import GRPC_CHANNEL_POOL_SIZE
 from flwr.common.logger import log, warn_deprecated_feature, warn_experimental_feature
 from flwr.common.message import Error
 from flwr.common.object_ref import load_app, validate
-from flwr.common.retry_invoker import RetryInvoker, exponential
+from flwr.common.payload import PayloadBackend, offload_payloads, restore_payloads
+from flwr.common.retry_invoker import RetryInvoker, RetryState, exponential, full_jitter
 
-from .grpc_client.connection import grpc_connection
-from .grpc_rere_client.connection import grpc_request_response
 from .message_handler.message_handler import handle_control_message
 from .node_state import NodeState
 from .numpy_client import NumPyClient
 
+# Backoff of the wait between two requests for a message while none is available.
+# Including the jitter, the wait never exceeds the former fixed interval of 3s, so
+# an idle client does not pick up new messages later than before.
+POLL_BASE_DELAY = 0.5
+POLL_MAX_DELAY = 2
+POLL_MAX_JITTER = 0.5
+
 
 def run_client_app() -> None:
     """Run Flower client app."""
@@ -198,6 +204,40 @@ def _check_actionable_client(
         )
 
 
+def _on_giveup(retry_state: RetryState) -> None:
+    """Log that the client gave up reconnecting."""
+    if retry_state.tries > 1:
+        log(
+            WARN,
+            "Giving up reconnection after %.2f seconds and %s tries.",
+            retry_state.elapsed_time,
+            retry_state.tries,
+        )
+
+
+def _on_success(retry_state: RetryState) -> None:
+    """Log that the client reconnected after failed attempts."""
+    if retry_state.tries > 1:
+        log(
+            INFO,
+            "Connection successful after %.2f seconds and %s tries.",
+            retry_state.elapsed_time,
+            retry_state.tries,
+        )
+
+
+def _on_backoff(retry_state: RetryState) -> None:
+    """Log a failed connection attempt."""
+    if retry_state.tries == 1:
+        log(WARN, "Connection attempt failed, retrying...")
+    else:
+        log(
+            DEBUG,
+            "Connection attempt failed, retrying in %.2f seconds",
+            retry_state.actual_wait,
+        )
+
+
 # pylint: disable=import-outside-toplevel
 # pylint: disable=too-many-branches
 # pylint: disable=too-many-locals
@@ -214,6 +254,8 @@ def start_client(
     transport: Optional[str] = None,
     max_retries: Optional[int] = None,
     max_wait_time: Optional[float] = None,
+    pool_size: int = GRPC_CHANNEL_POOL_SIZE,
+    payload_backend: Optional[PayloadBackend] = None,
 ) -> None:
     """Start a Flower client node which connects to a Flower server.
 
@@ -255,6 +297,15 @@ def start_client(
         The maximum duration before the client stops trying to
         connect to the server in case of connection error.
         If set to None, there is no limit to the total time.
+    pool_size: int (default: 1)
+        The number of gRPC channels the client opens to the server. Requests are
+        distributed over the channels in a round-robin fashion. Only used by the
+        'grpc-rere' transport.
+    payload_backend: Optional[PayloadBackend] (default: None)
+        An object store used to transfer large arrays out-of-band. If provided,
+        arrays in received messages that reference the object store are
+        downloaded, and large arrays in replies are uploaded and replaced by
+        references. The server needs to use the same object store.
 
     Examples
     --------
@@ -298,6 +349,8 @@ def start_client(
         transport=transport,
         max_retries=max_retries,
         max_wait_time=max_wait_time,
+        pool_size=pool_size,
+        payload_backend=payload_backend,
     )
     event(EventType.START_CLIENT_LEAVE)
 
@@ -318,6 +371,9 @@ def _start_client_internal(
     transport: Optional[str] = None,
     max_retries: Optional[int] = None,
     max_wait_time: Optional[float] = None,
+    pool_size: int = GRPC_CHANNEL_POOL_SIZE,
+    payload_backend: Optional[PayloadBackend] = None,
+    reload_per_message: bool = False,
 ) -> None:
     """Start a Flower client node which connects to a Flower server.
 
@@ -361,6 +417,18 @@ def _start_client_internal(
         The maximum duration before the client stops trying to
         connect to the server in case of connection error.
         If set to None, there is no limit to the total time.
+    pool_size: int (default: 1)
+        The number of gRPC channels the client opens to the server. Requests are
+        distributed over the channels in a round-robin fashion. Only used by the
+        'grpc-rere' transport.
+    payload_backend: Optional[PayloadBackend] (default: None)
+        An object store used to transfer large arrays out-of-band. If provided,
+        arrays in received messages that reference the object store are
+        downloaded, and large arrays in replies are uploaded and replaced by
+        references. The server needs to use the same object store.
+    reload_per_message: bool (default: False)
+        Load the `ClientApp` again for every received message. By default, the
+        `ClientApp` is loaded once per run and reused for all messages of the run.
     """
     if insecure is None:
         insecure = root_certificates is None
@@ -393,7 +461,7 @@ def _start_client_internal(
 
     # Initialize connection context manager
     connection, address, connection_error_type = _init_connection(
-        transport, server_address
+        transport, server_address, pool_size
     )
 
     retry_invoker = RetryInvoker(
@@ -401,71 +469,60 @@ def _start_client_internal(
         recoverable_exceptions=connection_error_type,
         max_tries=max_retries,
         max_time=max_wait_time,
-        on_giveup=lambda retry_state: (
-            log(
-                WARN,
-                "Giving up reconnection after %.2f seconds and %s tries.",
-                retry_state.elapsed_time,
-                retry_state.tries,
-            )
-            if retry_state.tries > 1
-            else None
-        ),
-        on_success=lambda retry_state: (
-            log(
-                INFO,
-                "Connection successful after %.2f seconds and %s tries.",
-                retry_state.elapsed_time,
-                retry_state.tries,
-            )
-            if retry_state.tries > 1
-            else None
-        ),
-        on_backoff=lambda retry_state: (
-            log(WARN, "Connection attempt failed, retrying...")
-            if retry_state.tries == 1
-            else log(
-                DEBUG,
-                "Connection attempt failed, retrying in %.2f seconds",
-                retry_state.actual_wait,
-            )
-        ),
+        on_giveup=_on_giveup,
+        on_success=_on_success,
+        on_backoff=_on_backoff,
     )
 
     node_state = NodeState()
 
-    while True:
-        sleep_duration: int = 0
-        with connection(
-            address,
-            insecure,
-            retry_invoker,
-            grpc_max_message_length,
-            root_certificates,
-        ) as conn:
-            receive, send, create_node, delete_node = conn
+    # The connection is established once and reused when the server asks the
+    # client to reconnect, only the node registration and the receive/send loop
+    # are restarted (this avoids a new TLS handshake on every reconnect)
+    with connection(
+        address,
+        insecure,
+        retry_invoker,
+        grpc_max_message_length,
+        root_certificates,
+    ) as conn:
+        receive, send, create_node, delete_node = conn
+
+        while True:
+            sleep_duration: int = 0
 
             # Register node
             if create_node is not None:
                 create_node()  # pylint: disable=not-callable
 
+            # Context of the most recent run, only looked up when the run changes
+            last_run_id: Optional[int] = None
+            context: Optional[Context] = None
+
+            # ClientApp of the most recent run, only loaded when the run changes
+            cached_app: Optional[ClientApp] = None
+            cached_app_run_id: Optional[int] = None
+
+            # Wait increasingly longer before asking again while no message arrives
+            poll_wait = exponential(
+                base_delay=POLL_BASE_DELAY, max_delay=POLL_MAX_DELAY
+            )
+
             while True:
                 # Receive
                 message = receive()
                 if message is None:
-                    time.sleep(3)  # Wait for 3s before asking again
+                    time.sleep(next(poll_wait) + full_jitter(POLL_MAX_JITTER))
                     continue
+                poll_wait = exponential(
+                    base_delay=POLL_BASE_DELAY, max_delay=POLL_MAX_DELAY
+                )
 
-                log(INFO, "")
                 log(
                     INFO,
-                    "[RUN %s, ROUND %s]",
+                    "[RUN %s, ROUND %s] Received: %s message %s",
                     message.metadata.run_id,
                     message.metadata.group_id,
-                )
-                log(
-                    INFO,
-                    "Received: %s message %s",
                     message.metadata.message_type,
                     message.metadata.message_id,
                 )
@@ -476,11 +533,15 @@ def _start_client_internal(
                     send(out_message)
                     break
 
-                # Register context for this run
-                node_state.register_context(run_id=message.metadata.run_id)
+                if message.metadata.run_id != last_run_id or context is None:
+                    # Register context for this run
+                    node_state.register_context(run_id=message.metadata.run_id)
 
-                # Retrieve context for this run
-                context = node_state.retrieve_context(run_id=message.metadata.run_id)
+                    # Retrieve context for this run
+                    context = node_state.retrieve_context(
+                        run_id=message.metadata.run_id
+                    )
+                    last_run_id = message.metadata.run_id
 
                 # Create an error reply message that will never be used to prevent
                 # the used-before-assignment linting error
@@ -490,10 +551,30 @@ def _start_client_internal(
 
                 # Handle app loading and task message
                 try:
+                    # Download payloads referenced in the message
+                    if payload_backend is not None and message.has_content():
+                        message.content = restore_payloads(
+                            message.content, payload_backend
+                        )
+
                     # Load ClientApp instance
-                    client_app: ClientApp = load_client_app_fn()
+                    if (
+                        reload_per_message
+                        or cached_app is None
+                        or cached_app_run_id != message.metadata.run_id
+                    ):
+                        cached_app = load_client_app_fn()
+                        cached_app_run_id = message.metadata.run_id
+                    client_app: ClientApp = cached_app
 
                     reply_message = client_app(message=message, context=context)
+
+                    # Upload large payloads of the reply
+                    if payload_backend is not None and reply_message.has_content():
+                        reply_message.content = offload_payloads(
+                            reply_message.content, payload_backend
+                        )
+
                     # Update node state
                     node_state.update_context(
                         run_id=message.metadata.run_id,
@@ -510,8 +591,8 @@ def _start_client_internal(
                     # Don't update/change NodeState
 
                     # Create error message
-                    # Reason example: "<class 'ZeroDivisionError'>:<'division by zero'>"
-                    reason = str(type(ex)) + ":<'" + str(ex) + "'>"
+                    # Reason example: "ZeroDivisionError:<'division by zero'>"
+                    reason = f"{type(ex).__name__}:<'{ex}'>"
                     reply_message = message.create_error_reply(
                         error=Error(code=0, reason=reason)
                     )
@@ -524,16 +605,16 @@ def _start_client_internal(
             if delete_node is not None:
                 delete_node()  # pylint: disable=not-callable
 
-        if sleep_duration == 0:
-            log(INFO, "Disconnect and shut down")
-            break
-        # Sleep and reconnect afterwards
-        log(
-            INFO,
-            "Disconnect, then re-establish connection after %s second(s)",
-            sleep_duration,
-        )
-        time.sleep(sleep_duration)
+            if sleep_duration == 0:
+                log(INFO, "Disconnect and shut down")
+                break
+            # Sleep and reconnect afterwards
+            log(
+                INFO,
+                "Keep the connection open, re-register node after %s second(s)",
+                sleep_duration,
+            )
+            time.sleep(sleep_duration)
 
 
 def start_numpy_client(
@@ -637,23 +718,69 @@ def start_numpy_client(
     )
 
 
-def _init_connection(transport: Optional[str], server_address: str) -> Tuple[
-    Callable[
-        [str, bool, RetryInvoker, int, Union[bytes, str, None]],
-        ContextManager[
-            Tuple[
-                Callable[[], Optional[Message]],
-                Callable[[Message], None],
-                Optional[Callable[[], None]],
-                Optional[Callable[[], None]],
-            ]
-        ],
+Connection = Callable[
+    [str, bool, RetryInvoker, int, Union[bytes, str, None]],
+    ContextManager[
+        Tuple[
+            Callable[[], Optional[Message]],
+            Callable[[Message], None],
+            Optional[Callable[[], None]],
+            Optional[Callable[[], None]],
+        ]
     ],
-    str,
-    Type[Exception],
-]:
+]
+
+
+@lru_cache(maxsize=1)
+def _load_rest_transport() -> Tuple[Connection, Type[Exception]]:
+    """Return the REST connection, exit if the `rest` extra is not installed.
+
+    The result is cached, so that the optional dependencies are only probed once.
+    """
+    try:
+        from requests.exceptions import ConnectionError as RequestsConnectionError
+
+        from .rest_client.connection import http_request_response
+    except ModuleNotFoundError:
+        sys.exit(MISSING_EXTRA_REST)
+    return http_request_response, RequestsConnectionError
+
+
+def _load_grpc_rere_transport() -> Tuple[Connection, Type[Exception]]:
+    """Return the gRPC request-response connection."""
+    from grpc import RpcError
+
+    from .grpc_rere_client.connection import grpc_request_response
+
+    return grpc_request_response, RpcError
+
+
+def _load_grpc_bidi_transport() -> Tuple[Connection, Type[Exception]]:
+    """Return the gRPC bidirectional streaming connection."""
+    from grpc import RpcError
+
+    from .grpc_client.connection import grpc_connection
+
+    return grpc_connection, RpcError
+
+
+# Server addresses are parsed again on every (re)start of a client
+_parse_address_cached = lru_cache(maxsize=32)(parse_address)
+
+_TRANSPORT_DISPATCH: Dict[str, Callable[[], Tuple[Connection, Type[Exception]]]] = {
+    TRANSPORT_TYPE_REST: _load_rest_transport,
+    TRANSPORT_TYPE_GRPC_RERE: _load_grpc_rere_transport,
+    TRANSPORT_TYPE_GRPC_BIDI: _load_grpc_bidi_transport,
+}
+
+
+def _init_connection(
+    transport: Optional[str],
+    server_address: str,
+    pool_size: int = GRPC_CHANNEL_POOL_SIZE,
+) -> Tuple[Connection, str, Type[Exception]]:
     # Parse IP address
-    parsed_address = parse_address(server_address)
+    parsed_address = _parse_address_cached(server_address)
     if not parsed_address:
         sys.exit(f"Server address ({server_address}) cannot be parsed.")
     host, port, is_v6 = parsed_address
@@ -664,26 +791,21 @@ def _init_connection(transport: Optional[str], server_address: str) -> Tuple[
         transport = TRANSPORT_TYPE_GRPC_BIDI
 
     # Use either gRPC bidirectional streaming or REST request/response
-    if transport == TRANSPORT_TYPE_REST:
-        try:
-            from requests.exceptions import ConnectionError as RequestsConnectionError
-
-            from .rest_client.connection import http_request_response
-        except ModuleNotFoundError:
-            sys.exit(MISSING_EXTRA_REST)
-        if server_address[:4] != "http":
-            sys.exit(
-                "When using the REST API, please provide `https://` or "
-                "`http://` before the server address (e.g. `http://127.0.0.1:8080`)"
-            )
-        connection, error_type = http_request_response, RequestsConnectionError
-    elif transport == TRANSPORT_TYPE_GRPC_RERE:
-        connection, error_type = grpc_request_response, RpcError
-    elif transport == TRANSPORT_TYPE_GRPC_BIDI:
-        connection, error_type = grpc_connection, RpcError
-    else:
+    try:
+        load_transport = _TRANSPORT_DISPATCH[transport]
+    except KeyError:
         raise ValueError(
-            f"Unknown transport type: {transport} (possible: {TRANSPORT_TYPES})"
+            f"Unknown transport type: {transport} "
+            f"(possible: {sorted(TRANSPORT_TYPES)})"
+        ) from None
+    connection, error_type = load_transport()
+
+    if transport == TRANSPORT_TYPE_REST and server_address[:4] != "http":
+        sys.exit(
+            "When using the REST API, please provide `https://` or "
+            "`http://` before the server address (e.g. `http://127.0.0.1:8080`)"
         )
+    if transport == TRANSPORT_TYPE_GRPC_RERE:
+        connection = partial(connection, pool_size=pool_size)
 
     return connection, address, error_type
@@ -19,8 +19,8 @@ import uuid
 from contextlib import contextmanager
 from logging import DEBUG
 from pathlib import Path
-from queue import Queue
-from typing import Callable, Iterator, Optional, Tuple, Union, cast
+from queue import Full, Queue
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union, cast
 
 from flwr.common import (
     DEFAULT_TTL,
@@ -33,7 +33,7 @@ from flwr.common import (
 from flwr.common import recordset_compat as compat
 from flwr.common import serde
 from flwr.common.constant import MessageType, MessageTypeLegacy
-from flwr.common.grpc import create_channel
+from flwr.common.grpc import GRPC_CLIENT_KEEPALIVE_OPTIONS, create_channel
 from flwr.common.logger import log
 from flwr.common.retry_invoker import RetryInvoker
 from flwr.proto.transport_pb2 import (  # pylint: disable=E0611
@@ -49,6 +49,10 @@ from flwr.proto.transport_pb2_grpc import FlowerServiceStub  # pylint: disable=E
 # os.environ["GRPC_VERBOSITY"] = "debug"
 # os.environ["GRPC_TRACE"] = "tcp,http"
 
+KEY_QUEUE = "queue"
+KEY_ITERATOR = "server_message_iterator"
+KEY_REJOIN = "rejoin"
+
 
 def on_channel_state_change(channel_connectivity: str) -> None:
     """Log channel connectivity."""
@@ -123,18 +127,42 @@ def grpc_connection(  # pylint: disable=R0915
         insecure=insecure,
         root_certificates=root_certificates,
         max_message_length=max_message_length,
+        options=GRPC_CLIENT_KEEPALIVE_OPTIONS,
     )
     channel.subscribe(on_channel_state_change)
 
-    queue: Queue[ClientMessage] = Queue(  # pylint: disable=unsubscriptable-object
-        maxsize=1
-    )
     stub = FlowerServiceStub(channel)
 
-    server_message_iterator: Iterator[ServerMessage] = stub.Join(iter(queue.get, None))
+    # The channel is kept open across reconnects, only the `Join` stream is
+    # re-opened after the client replied to a `ReconnectIns`
+    stream: Dict[str, Any] = {KEY_REJOIN: False}
+
+    def join() -> None:
+        """Open a new `Join` stream on the channel."""
+        # One slot for the `ClientMessage`, one for the `None` sentinel
+        queue: Queue[Optional[ClientMessage]] = Queue(  # pylint: disable=E1136
+            maxsize=2
+        )
+        stream[KEY_QUEUE] = queue
+        stream[KEY_ITERATOR] = stub.Join(iter(queue.get, None))
+        stream[KEY_REJOIN] = False
+
+    def leave() -> None:
+        """Close the request stream of the current `Join` stream."""
+        try:
+            stream[KEY_QUEUE].put(None, block=False)
+        except Full:
+            pass
+
+    join()
 
     def receive() -> Message:
+        # Re-open the stream if the previous one was closed by a reconnect
+        if stream[KEY_REJOIN]:
+            join()
+
         # Receive ServerMessage proto
+        server_message_iterator: Iterator[ServerMessage] = stream[KEY_ITERATOR]
         proto = next(server_message_iterator)
 
         # ServerMessage proto --> *Ins --> RecordSet
@@ -220,12 +248,21 @@ def grpc_connection(  # pylint: disable=R0915
             raise ValueError(f"Invalid message type: {message_type}")
 
         # Send ClientMessage proto
-        return queue.put(msg_proto, block=False)
+        queue: Queue[Optional[ClientMessage]]  # pylint: disable=E1136
+        queue = stream[KEY_QUEUE]
+        queue.put(msg_proto, block=False)
+
+        # Close the stream after replying to a `ReconnectIns`, the next call to
+        # `receive` re-opens it on the same channel
+        if msg_proto.HasField("disconnect_res"):
+            leave()
+            stream[KEY_REJOIN] = True
 
     try:
         # Yield methods
         yield (receive, send, None, None)
     finally:
         # Make sure to have a final
+        leave()
         channel.close()
         log(DEBUG, "gRPC channel closed")
@@ -17,8 +17,9 @@
 
 import concurrent.futures
 import socket
+import threading
 from contextlib import closing
-from typing import Iterator, cast
+from typing import Iterator, List, cast
 from unittest.mock import patch
 
 import grpc
@@ -104,6 +105,26 @@ def mock_join(  # type: ignore # pylint: disable=invalid-name
             break
 
 
+JOIN_CALLS: List[int] = []
+JOIN_CALLS_LOCK = threading.Lock()
+
+
+def mock_join_reconnect(  # type: ignore # pylint: disable=invalid-name
+    _self,
+    request_iterator: Iterator[ClientMessage],
+    _context: grpc.ServicerContext,
+) -> Iterator[ServerMessage]:
+    """Serve as mock for the Join method, asking the client to reconnect."""
+    with JOIN_CALLS_LOCK:
+        JOIN_CALLS.append(1)
+
+    yield SERVER_MESSAGE_RECONNECT
+
+    # Wait for the `DisconnectRes` and the end of the request stream
+    for _ in request_iterator:
+        pass
+
+
 @patch(
     # pylint: disable=line-too-long
     "flwr.server.superlink.fleet.grpc_bidi.flower_service_servicer.FlowerServiceServicer.Join",  # noqa: E501
@@ -168,3 +189,51 @@ def test_integration_connection() -> None:
 
     # Teardown
     server.stop(1)
+
+
+@patch(
+    # pylint: disable=line-too-long
+    "flwr.server.superlink.fleet.grpc_bidi.flower_service_servicer.FlowerServiceServicer.Join",  # noqa: E501
+    # pylint: enable=line-too-long
+    mock_join_reconnect,
+)
+def test_integration_connection_rejoin() -> None:
+    """Test that the next `receive` after a reply to `ReconnectIns` re-joins.
+
+    The client replies to `ReconnectIns` and the next `receive` opens a new `Join`
+    stream on the same channel.
+    """
+    # Prepare
+    port = unused_tcp_port()
+    JOIN_CALLS.clear()
+
+    server = start_grpc_server(
+        client_manager=SimpleClientManager(), server_address=f"[::]:{port}"
+    )
+
+    # Execute
+    message_types: List[str] = []
+    with grpc_connection(
+        server_address=f"[::]:{port}",
+        insecure=True,
+        retry_invoker=RetryInvoker(
+            wait_gen_factory=exponential,
+            recoverable_exceptions=grpc.RpcError,
+            max_tries=1,
+            max_time=None,
+        ),
+    ) as conn:
+        receive, send, _, _ = conn
+
+        for _ in range(2):
+            message = receive()
+            assert message is not None
+            message_types.append(message.metadata.message_type)
+            send(MESSAGE_DISCONNECT)
+
+    # Assert
+    assert message_types == ["reconnect", "reconnect"]
+    assert len(JOIN_CALLS) == 2
+
+    # Teardown
+    server.stop(1)
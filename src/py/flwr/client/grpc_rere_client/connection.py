@@ -15,16 +15,25 @@
 """Contextmanager for a gRPC request-response channel to the Flower server."""
 
 
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
 from copy import copy
+from itertools import cycle
 from logging import DEBUG, ERROR
 from pathlib import Path
-from typing import Callable, Dict, Iterator, Optional, Tuple, Union, cast
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union, cast
+
+import grpc
 
 from flwr.client.message_handler.message_handler import validate_out_message
 from flwr.client.message_handler.task_handler import get_task_ins, validate_task_ins
 from flwr.common import GRPC_MAX_MESSAGE_LENGTH
-from flwr.common.grpc import create_channel
+from flwr.common.grpc import (
+    GRPC_CHANNEL_POOL_SIZE,
+    GRPC_CLIENT_KEEPALIVE_OPTIONS,
+    create_channel,
+)
 from flwr.common.logger import log, warn_experimental_feature
 from flwr.common.message import Message, Metadata
 from flwr.common.retry_invoker import RetryInvoker
@@ -33,6 +42,7 @@ from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
     CreateNodeRequest,
     DeleteNodeRequest,
     PullTaskInsRequest,
+    PullTaskInsResponse,
     PushTaskResRequest,
 )
 from flwr.proto.fleet_pb2_grpc import FleetStub  # pylint: disable=E0611
@@ -41,6 +51,9 @@ from flwr.proto.task_pb2 import TaskIns  # pylint: disable=E0611
 
 KEY_NODE = "node"
 KEY_METADATA = "in_message_metadata"
+KEY_STREAM = "pull_task_ins_stream"
+KEY_STREAMING = "streaming"
+KEY_PUSH = "pending_push"
 
 
 def on_channel_state_change(channel_connectivity: str) -> None:
@@ -49,12 +62,13 @@ def on_channel_state_change(channel_connectivity: str) -> None:
 
 
 @contextmanager
-def grpc_request_response(
+def grpc_request_response(  # pylint: disable=R0913, R0914, R0915
     server_address: str,
     insecure: bool,
     retry_invoker: RetryInvoker,
     max_message_length: int = GRPC_MAX_MESSAGE_LENGTH,  # pylint: disable=W0613
     root_certificates: Optional[Union[bytes, str]] = None,
+    pool_size: int = GRPC_CHANNEL_POOL_SIZE,
 ) -> Iterator[
     Tuple[
         Callable[[], Optional[Message]],
@@ -68,6 +82,20 @@ def grpc_request_response(
     One notable difference to the grpc_connection context manager is that
     `receive` can return `None`.
 
+    TaskIns are received via `PullTaskInsStream` long-polls, so that they arrive as
+    soon as they are available. Each stream delivers at most one TaskIns. If the
+    server does not serve the stream, the client falls back to polling via
+    `PullTaskIns`.
+
+    TaskRes are serialized and pushed by a background sender thread, so that
+    `send` returns as soon as the reply is validated and the serialization and the
+    `PushTaskRes` round trip overlap with waiting for the next TaskIns. `receive`
+    waits for the pending push to complete before it returns the next message, so
+    the reply is never serialized while the next ClientApp call runs. Pushes are
+    performed in order, and an error raised by a push is re-raised by the next
+    call to `receive`, `send` or `delete_node`. A `receive` that blocks on the
+    stream while the push fails is interrupted.
+
     Parameters
     ----------
     server_address : str
@@ -87,6 +115,10 @@ def grpc_request_response(
         Path of the root certificate. If provided, a secure
         connection using the certificates will be established to an SSL-enabled
         Flower server. Bytes won't work for the REST API.
+    pool_size : int (default: 1)
+        The number of independent gRPC channels to open. RPCs are dispatched to
+        the channels in a round-robin fashion so that concurrent requests are not
+        serialized behind a single HTTP/2 connection.
 
     Returns
     -------
@@ -100,14 +132,39 @@ def grpc_request_response(
     if isinstance(root_certificates, str):
         root_certificates = Path(root_certificates).read_bytes()
 
-    channel = create_channel(
-        server_address=server_address,
-        insecure=insecure,
-        root_certificates=root_certificates,
-        max_message_length=max_message_length,
-    )
-    channel.subscribe(on_channel_state_change)
-    stub = FleetStub(channel)
+    if pool_size < 1:
+        raise ValueError("`pool_size` must be >= 1")
+
+    # Parse the certificates once for all channels of the pool
+    credentials: Optional[Union[bytes, grpc.ChannelCredentials]] = root_certificates
+    if not insecure:
+        credentials = grpc.ssl_channel_credentials(root_certificates)
+
+    channels: List[grpc.Channel] = []
+    for _ in range(pool_size):
+        channel = create_channel(
+            server_address=server_address,
+            insecure=insecure,
+            root_certificates=credentials,
+            max_message_length=max_message_length,
+            # Force each channel to use its own subchannel (i.e., its own TCP
+            # connection) instead of sharing the global subchannel pool
+            options=[
+                *GRPC_CLIENT_KEEPALIVE_OPTIONS,
+                ("grpc.use_local_subchannel_pool", 1),
+            ],
+        )
+        channel.subscribe(on_channel_state_change)
+        channels.append(channel)
+
+    # Round-robin over the stubs of all channels
+    stubs = cycle([FleetStub(channel) for channel in channels])
+    stubs_lock = threading.Lock()
+
+    def next_stub() -> FleetStub:
+        """Return the stub of the next channel in the pool."""
+        with stubs_lock:
+            return next(stubs)
 
     # Necessary state to validate messages to be sent
     state: Dict[str, Optional[Metadata]] = {KEY_METADATA: None}
@@ -115,6 +172,97 @@ def grpc_request_response(
     # Enable create_node and delete_node to store node
     node_store: Dict[str, Optional[Node]] = {KEY_NODE: None}
 
+    # Open `PullTaskInsStream` stream, if any
+    stream_store: Dict[str, Any] = {KEY_STREAM: None, KEY_STREAMING: True}
+
+    def close_stream() -> None:
+        """Cancel the open `PullTaskInsStream` stream, if any."""
+        if stream_store[KEY_STREAM] is not None:
+            stream_store[KEY_STREAM].cancel()
+            stream_store[KEY_STREAM] = None
+
+    def open_stream(request: PullTaskInsRequest) -> Optional[Any]:
+        """Open a `PullTaskInsStream` stream once the server serves it.
+
+        Returns `None` if the server does not serve the stream, either because it
+        does not implement it or because too many nodes are streaming already.
+        """
+        stream = next_stub().PullTaskInsStream(request)
+        # The server sends its initial metadata as soon as it serves the stream
+        stream.initial_metadata()
+        if stream.done() and stream.code() != grpc.StatusCode.OK:
+            if stream.code() in (
+                grpc.StatusCode.UNIMPLEMENTED,
+                grpc.StatusCode.RESOURCE_EXHAUSTED,
+            ):
+                return None
+            # The call is the `RpcError`, let `RetryInvoker` retry it
+            raise stream
+        return stream
+
+    def pull_task_ins_stream(
+        request: PullTaskInsRequest,
+    ) -> Optional[PullTaskInsResponse]:
+        """Return the response of a `PullTaskInsStream` stream.
+
+        Each stream delivers at most one TaskIns. Only opening the stream is
+        retried, a stream that breaks while waiting for a TaskIns yields an empty
+        response, so that the next `receive` opens a new one. Returns `None` if the
+        server does not serve the stream.
+        """
+        if stream_store[KEY_STREAM] is None:
+            stream = retry_invoker.invoke(open_stream, request)
+            if stream is None:
+                return None
+            stream_store[KEY_STREAM] = stream
+        # A push that fails from now on cancels the stream opened above
+        raise_failed_push()
+        try:
+            response: PullTaskInsResponse = next(stream_store[KEY_STREAM])
+        except StopIteration:
+            # The server closed the stream without a TaskIns
+            response = PullTaskInsResponse()
+        except grpc.RpcError:
+            stream_store[KEY_STREAM] = None
+            # The stream was cancelled because a push failed
+            raise_failed_push()
+            return PullTaskInsResponse()
+        stream_store[KEY_STREAM] = None
+        return response
+
+    # Push TaskRes in the background, one at a time to preserve their order
+    push_executor = ThreadPoolExecutor(max_workers=1)
+    push_store: Dict[str, Optional["Future[Any]"]] = {KEY_PUSH: None}
+
+    def push_task_res(message: Message) -> None:
+        """Serialize the message and push it as TaskRes to the server."""
+        # Construct TaskRes
+        task_res = message_to_taskres(message)
+
+        # Serialize ProtoBuf to bytes
+        request = PushTaskResRequest(task_res_list=[task_res])
+        _ = retry_invoker.invoke(next_stub().PushTaskRes, request)
+
+    def wait_for_push() -> None:
+        """Block until the pending `PushTaskRes`, if any, has completed."""
+        pending = push_store[KEY_PUSH]
+        if pending is not None:
+            # Re-raise the exception of a failed push, if any, on every call
+            pending.result()
+            push_store[KEY_PUSH] = None
+
+    def raise_failed_push() -> None:
+        """Re-raise the exception of the pending `PushTaskRes`, if it failed."""
+        pending = push_store[KEY_PUSH]
+        if pending is not None and pending.done():
+            wait_for_push()
+
+    def on_push_done(pending: "Future[Any]") -> None:
+        """Stop waiting for TaskIns on the open stream if the push failed."""
+        stream = stream_store[KEY_STREAM]
+        if pending.exception() is not None and stream is not None:
+            stream.cancel()
+
     ###########################################################################
     # receive/send functions
     ###########################################################################
@@ -123,7 +271,7 @@ def grpc_request_response(
         """Set create_node."""
         create_node_request = CreateNodeRequest()
         create_node_response = retry_invoker.invoke(
-            stub.CreateNode,
+            next_stub().CreateNode,
             request=create_node_request,
         )
         node_store[KEY_NODE] = create_node_response.node
@@ -136,8 +284,14 @@ def grpc_request_response(
             return
         node: Node = cast(Node, node_store[KEY_NODE])
 
+        # Make sure all TaskRes have been pushed before leaving
+        wait_for_push()
+
+        # Stop receiving TaskIns for this node
+        close_stream()
+
         delete_node_request = DeleteNodeRequest(node=node)
-        retry_invoker.invoke(stub.DeleteNode, request=delete_node_request)
+        retry_invoker.invoke(next_stub().DeleteNode, request=delete_node_request)
 
         del node_store[KEY_NODE]
 
@@ -149,9 +303,19 @@ def grpc_request_response(
             return None
         node: Node = cast(Node, node_store[KEY_NODE])
 
+        # The server will not send new TaskIns if the last TaskRes was lost
+        raise_failed_push()
+
         # Request instructions (task) from server
         request = PullTaskInsRequest(node=node)
-        response = retry_invoker.invoke(stub.PullTaskIns, request=request)
+        response: Optional[PullTaskInsResponse] = None
+        if stream_store[KEY_STREAMING]:
+            response = pull_task_ins_stream(request)
+            if response is None:
+                log(DEBUG, "`PullTaskInsStream` not available, polling instead")
+                stream_store[KEY_STREAMING] = False
+        if response is None:
+            response = retry_invoker.invoke(next_stub().PullTaskIns, request=request)
 
         # Get the current TaskIns
         task_ins: Optional[TaskIns] = get_task_ins(response)
@@ -166,6 +330,10 @@ def grpc_request_response(
         # Construct the Message
         in_message = message_from_taskins(task_ins) if task_ins else None
 
+        # The previous reply must be serialized before the message is handled
+        if in_message is not None:
+            wait_for_push()
+
         # Remember `metadata` of the in message
         state[KEY_METADATA] = copy(in_message.metadata) if in_message else None
 
@@ -190,12 +358,11 @@ def grpc_request_response(
             log(ERROR, "Invalid out message")
             return
 
-        # Construct TaskRes
-        task_res = message_to_taskres(message)
-
-        # Serialize ProtoBuf to bytes
-        request = PushTaskResRequest(task_res_list=[task_res])
-        _ = retry_invoker.invoke(stub.PushTaskRes, request)
+        # Serialize and push in the background once the previous push has completed
+        wait_for_push()
+        pending = push_executor.submit(push_task_res, message)
+        pending.add_done_callback(on_push_done)
+        push_store[KEY_PUSH] = pending
 
         state[KEY_METADATA] = None
 
@@ -204,3 +371,13 @@ def grpc_request_response(
         yield (receive, send, create_node, delete_node)
     except Exception as exc:  # pylint: disable=broad-except
         log(ERROR, exc)
+    finally:
+        try:
+            wait_for_push()
+        except Exception as exc:  # pylint: disable=broad-except
+            log(ERROR, exc)
+        push_executor.shutdown(wait=True)
+        close_stream()
+        for channel in channels:
+            channel.close()
+        log(DEBUG, "gRPC channels closed")
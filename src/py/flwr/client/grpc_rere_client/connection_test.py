@@ -0,0 +1,347 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for module connection."""
+
+
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, List, Optional, Tuple, Union
+from unittest.mock import patch
+
+import grpc
+import pytest
+
+from flwr.common import DEFAULT_TTL, RecordSet
+from flwr.common.retry_invoker import RetryInvoker, constant
+from flwr.common.serde import recordset_to_proto
+from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
+    CreateNodeRequest,
+    CreateNodeResponse,
+    DeleteNodeRequest,
+    DeleteNodeResponse,
+    PullTaskInsRequest,
+    PullTaskInsResponse,
+    PushTaskResRequest,
+    PushTaskResResponse,
+)
+from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
+from flwr.proto.task_pb2 import Task, TaskIns  # pylint: disable=E0611
+
+from .connection import grpc_request_response
+
+NODE_ID = 7
+
+
+class MockRpcError(grpc.RpcError):  # type: ignore
+    """RpcError with a status code."""
+
+    def __init__(self, code: grpc.StatusCode) -> None:
+        super().__init__()
+        self._code = code
+
+    def code(self) -> grpc.StatusCode:
+        """Return the status code."""
+        return self._code
+
+
+class MockStream(MockRpcError):
+    """Server stream of `PullTaskInsResponse` that can be cancelled.
+
+    A stream created with a status code other than `OK` is terminated by the
+    server right when it is opened.
+    """
+
+    def __init__(self, code: grpc.StatusCode = grpc.StatusCode.OK) -> None:
+        super().__init__(code)
+        self.items: "queue.Queue[Union[PullTaskInsResponse, Exception, None]]" = (
+            queue.Queue()
+        )
+
+    def __iter__(self) -> Iterator[PullTaskInsResponse]:
+        """Return the stream itself."""
+        return self
+
+    def __next__(self) -> PullTaskInsResponse:
+        """Block until the next response (or error) is available."""
+        item = self.items.get(timeout=10)
+        if item is None:
+            raise StopIteration
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    def initial_metadata(self) -> Tuple[Tuple[str, str], ...]:
+        """Return the initial metadata sent by the server."""
+        return ()
+
+    def done(self) -> bool:
+        """Return whether the stream was terminated when it was opened."""
+        return bool(self.code() != grpc.StatusCode.OK)
+
+    def cancel(self) -> None:
+        """Cancel the stream."""
+        self.items.put(MockRpcError(grpc.StatusCode.CANCELLED))
+
+
+class MockFleetStub:  # pylint: disable=invalid-name, unused-argument
+    """FleetStub that serves TaskIns from mock streams."""
+
+    def __init__(self) -> None:
+        self.streams: "queue.Queue[MockStream]" = queue.Queue()
+        self.opened_streams: List[MockStream] = []
+        self.pull_task_ins_responses: List[PullTaskInsResponse] = []
+        self.pushed: List[str] = []
+        self.push_error: Optional[Exception] = None
+        self.push_delay = 0.0
+
+    def CreateNode(self, request: CreateNodeRequest, **_: Any) -> CreateNodeResponse:
+        """Register the node."""
+        return CreateNodeResponse(node=Node(node_id=NODE_ID, anonymous=False))
+
+    def DeleteNode(self, request: DeleteNodeRequest, **_: Any) -> DeleteNodeResponse:
+        """Unregister the node."""
+        return DeleteNodeResponse()
+
+    def PullTaskInsStream(self, request: PullTaskInsRequest) -> MockStream:
+        """Open the next stream."""
+        stream = self.streams.get(timeout=10)
+        self.opened_streams.append(stream)
+        return stream
+
+    def PullTaskIns(self, request: PullTaskInsRequest, **_: Any) -> PullTaskInsResponse:
+        """Return the next response."""
+        return self.pull_task_ins_responses.pop(0)
+
+    def PushTaskRes(self, request: PushTaskResRequest) -> PushTaskResResponse:
+        """Record the pushed TaskRes."""
+        time.sleep(self.push_delay)
+        if self.push_error is not None:
+            raise self.push_error
+        self.pushed.append(request.task_res_list[0].task.ancestry[0])
+        return PushTaskResResponse()
+
+
+def create_task_ins(task_id: str) -> TaskIns:
+    """Create a TaskIns for testing."""
+    return TaskIns(
+        task_id=task_id,
+        group_id="",
+        run_id=0,
+        task=Task(
+            producer=Node(node_id=0, anonymous=True),
+            consumer=Node(node_id=NODE_ID, anonymous=False),
+            created_at=time.time() - 1.0,
+            ttl=DEFAULT_TTL,
+            task_type="query",
+            recordset=recordset_to_proto(RecordSet()),
+        ),
+    )
+
+
+def create_response(task_id: str) -> PullTaskInsResponse:
+    """Create a PullTaskInsResponse with one TaskIns."""
+    return PullTaskInsResponse(task_ins_list=[create_task_ins(task_id)])
+
+
+def create_retry_invoker(max_tries: int = 1) -> RetryInvoker:
+    """Create a RetryInvoker that retries right away."""
+    return RetryInvoker(
+        wait_gen_factory=lambda: constant(0.0),
+        recoverable_exceptions=grpc.RpcError,
+        max_tries=max_tries,
+        max_time=None,
+    )
+
+
+@pytest.fixture(name="stub")
+def fixture_stub() -> Iterator[MockFleetStub]:
+    """Patch FleetStub to return a MockFleetStub."""
+    stub = MockFleetStub()
+    with patch("flwr.client.grpc_rere_client.connection.FleetStub", return_value=stub):
+        yield stub
+
+
+def test_push_task_res_in_order(stub: MockFleetStub) -> None:
+    """Test that TaskRes are pushed in the order of the replies."""
+    # Prepare
+    for task_id in ["a", "b", "c"]:
+        stream = MockStream()
+        stream.items.put(create_response(task_id))
+        stub.streams.put(stream)
+    stub.push_delay = 0.05
+
+    # Execute
+    with grpc_request_response(
+        server_address="localhost:1",
+        insecure=True,
+        retry_invoker=create_retry_invoker(),
+    ) as conn:
+        receive, send, create_node, delete_node = conn
+        assert create_node is not None and delete_node is not None
+        create_node()
+        for _ in range(3):
+            message = receive()
+            assert message is not None
+            send(message.create_reply(RecordSet()))
+        delete_node()
+
+    # Assert
+    assert stub.pushed == ["a", "b", "c"]
+    assert len(stub.opened_streams) == 3
+
+
+def test_receive_waits_for_push(stub: MockFleetStub) -> None:
+    """Test that receive returns a message only after the last reply was pushed."""
+    # Prepare
+    for task_id in ["a", "b"]:
+        stream = MockStream()
+        stream.items.put(create_response(task_id))
+        stub.streams.put(stream)
+    stub.push_delay = 0.2
+    pushed: List[List[str]] = []
+
+    # Execute
+    with grpc_request_response(
+        server_address="localhost:1",
+        insecure=True,
+        retry_invoker=create_retry_invoker(),
+    ) as conn:
+        receive, send, create_node, _ = conn
+        assert create_node is not None
+        create_node()
+        message = receive()
+        assert message is not None
+        send(message.create_reply(RecordSet()))
+        message = receive()
+        pushed.append(list(stub.pushed))
+
+    # Assert
+    assert message is not None and message.metadata.message_id == "b"
+    assert pushed == [["a"]]
+
+
+def test_failed_push_is_raised_by_receive(stub: MockFleetStub) -> None:
+    """Test that a receive blocked on the stream raises the error of a push."""
+    # Prepare
+    streams = [MockStream(), MockStream()]
+    for stream in streams:
+        stub.streams.put(stream)
+    streams[0].items.put(create_response("a"))
+    stub.push_error = ValueError("push failed")
+    stub.push_delay = 0.05
+    raised: List[Exception] = []
+
+    # Execute
+    with grpc_request_response(
+        server_address="localhost:1",
+        insecure=True,
+        retry_invoker=create_retry_invoker(),
+    ) as conn:
+        receive, send, create_node, _ = conn
+        assert create_node is not None
+        create_node()
+        message = receive()
+        assert message is not None
+        send(message.create_reply(RecordSet()))
+        # No further TaskIns is sent, so `receive` returns only if interrupted
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(receive)
+            raised.append(future.exception(timeout=10))  # type: ignore
+
+    # Assert
+    assert isinstance(raised[0], ValueError)
+    assert not stub.pushed
+
+
+@pytest.mark.parametrize(
+    "code", [grpc.StatusCode.UNIMPLEMENTED, grpc.StatusCode.RESOURCE_EXHAUSTED]
+)
+def test_fallback_to_pull_task_ins(stub: MockFleetStub, code: grpc.StatusCode) -> None:
+    """Test that TaskIns are polled if the server does not serve the stream."""
+    # Prepare
+    stub.streams.put(MockStream(code))
+    stub.pull_task_ins_responses = [create_response("a"), PullTaskInsResponse()]
+
+    # Execute
+    with grpc_request_response(
+        server_address="localhost:1",
+        insecure=True,
+        retry_invoker=create_retry_invoker(max_tries=2),
+    ) as conn:
+        receive, _, create_node, _ = conn
+        assert create_node is not None
+        create_node()
+        first = receive()
+        second = receive()
+
+    # Assert
+    assert first is not None and first.metadata.message_id == "a"
+    assert second is None
+    assert len(stub.opened_streams) == 1
+    assert not stub.pull_task_ins_responses
+
+
+def test_reopen_stream(stub: MockFleetStub) -> None:
+    """Test that a new stream is opened after a stream ended or broke."""
+    # Prepare
+    streams = [MockStream(), MockStream(), MockStream()]
+    for stream in streams:
+        stub.streams.put(stream)
+    streams[0].items.put(None)
+    streams[1].items.put(MockRpcError(grpc.StatusCode.UNAVAILABLE))
+    streams[2].items.put(create_response("a"))
+    results: List[Optional[str]] = []
+
+    # Execute
+    with grpc_request_response(
+        server_address="localhost:1",
+        insecure=True,
+        retry_invoker=create_retry_invoker(),
+    ) as conn:
+        receive, _, create_node, _ = conn
+        assert create_node is not None
+        create_node()
+        for _ in range(3):
+            message = receive()
+            results.append(message.metadata.message_id if message else None)
+
+    # Assert
+    assert results == [None, None, "a"]
+    assert stub.opened_streams == streams
+
+
+def test_retry_open_stream(stub: MockFleetStub) -> None:
+    """Test that opening the stream is retried if the server is unavailable."""
+    # Prepare
+    streams = [MockStream(grpc.StatusCode.UNAVAILABLE), MockStream()]
+    for stream in streams:
+        stub.streams.put(stream)
+    streams[1].items.put(create_response("a"))
+
+    # Execute
+    with grpc_request_response(
+        server_address="localhost:1",
+        insecure=True,
+        retry_invoker=create_retry_invoker(max_tries=2),
+    ) as conn:
+        receive, _, create_node, _ = conn
+        assert create_node is not None
+        create_node()
+        message = receive()
+
+    # Assert
+    assert message is not None and message.metadata.message_id == "a"
+    assert stub.opened_streams == streams
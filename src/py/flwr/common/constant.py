@@ -17,6 +17,8 @@
 
 from __future__ import annotations
 
+from enum import Enum
+
 MISSING_EXTRA_REST = """
 Extra dependencies required for using the REST-based Fleet API are missing.
 
@@ -25,46 +27,52 @@ To use the REST API, install `flwr` with the `rest` extra:
     `pip install flwr[rest]`.
 """
 
+MISSING_EXTRA_S3 = """
+Extra dependencies required for offloading payloads to S3 are missing.
+
+To use the S3 payload backend, install `flwr` with the `s3` extra:
+
+    `pip install flwr[s3]`.
+"""
+
 TRANSPORT_TYPE_GRPC_BIDI = "grpc-bidi"
 TRANSPORT_TYPE_GRPC_RERE = "grpc-rere"
 TRANSPORT_TYPE_REST = "rest"
 TRANSPORT_TYPE_VCE = "vce"
-TRANSPORT_TYPES = [
-    TRANSPORT_TYPE_GRPC_BIDI,
-    TRANSPORT_TYPE_GRPC_RERE,
-    TRANSPORT_TYPE_REST,
-    TRANSPORT_TYPE_VCE,
-]
+TRANSPORT_TYPES = frozenset(
+    {
+        TRANSPORT_TYPE_GRPC_BIDI,
+        TRANSPORT_TYPE_GRPC_RERE,
+        TRANSPORT_TYPE_REST,
+        TRANSPORT_TYPE_VCE,
+    }
+)
+
 
+class _StrEnum(str, Enum):
+    """String constants which compare, hash, and format like plain strings."""
 
-class MessageType:
+    def __str__(self) -> str:
+        """Return the value of the constant."""
+        return str(self.value)
+
+
+class MessageType(_StrEnum):
     """Message type."""
 
     TRAIN = "train"
     EVALUATE = "evaluate"
     QUERY = "query"
 
-    def __new__(cls) -> MessageType:
-        """Prevent instantiation."""
-        raise TypeError(f"{cls.__name__} cannot be instantiated.")
-
 
-class MessageTypeLegacy:
+class MessageTypeLegacy(_StrEnum):
     """Legacy message type."""
 
     GET_PROPERTIES = "get_properties"
     GET_PARAMETERS = "get_parameters"
 
-    def __new__(cls) -> MessageTypeLegacy:
-        """Prevent instantiation."""
-        raise TypeError(f"{cls.__name__} cannot be instantiated.")
 
-
-class SType:
+class SType(_StrEnum):
     """Serialisation type."""
 
     NUMPY = "numpy.ndarray"
-
-    def __new__(cls) -> SType:
-        """Prevent instantiation."""
-        raise TypeError(f"{cls.__name__} cannot be instantiated.")
@@ -16,7 +16,7 @@
 
 
 from logging import DEBUG
-from typing import Optional
+from typing import Any, List, Optional, Sequence, Tuple, Union
 
 import grpc
 
@@ -24,14 +24,34 @@ from flwr.common.logger import log
 
 GRPC_MAX_MESSAGE_LENGTH: int = 536_870_912  # == 512 * 1024 * 1024
 
+# Number of channels opened by request-response clients, a larger pool is opt-in
+GRPC_CHANNEL_POOL_SIZE: int = 1
+
+# Keepalive options for long-lived client channels, which allow dead connections
+# to be detected without recreating the channel. The keepalive time must not be
+# lower than the minimum ping interval accepted by the server (gRPC default: 5
+# minutes), otherwise the server closes the connection ("too_many_pings").
+GRPC_CLIENT_KEEPALIVE_OPTIONS: List[Tuple[str, Any]] = [
+    ("grpc.keepalive_time_ms", 300_000),
+    ("grpc.keepalive_timeout_ms", 10_000),
+    ("grpc.http2.max_pings_without_data", 0),
+]
+
 
 def create_channel(
     server_address: str,
     insecure: bool,
-    root_certificates: Optional[bytes] = None,
+    root_certificates: Optional[Union[bytes, grpc.ChannelCredentials]] = None,
     max_message_length: int = GRPC_MAX_MESSAGE_LENGTH,
+    options: Optional[Sequence[Tuple[str, Any]]] = None,
 ) -> grpc.Channel:
-    """Create a gRPC channel, either secure or insecure."""
+    """Create a gRPC channel, either secure or insecure.
+
+    Additional channel arguments can be passed via `options`, they are appended
+    to the default channel options. Instead of the PEM-encoded root certificates,
+    `root_certificates` can be pre-built `grpc.ChannelCredentials`, which avoids
+    parsing the certificates again when opening several channels.
+    """
     # Check for conflicting parameters
     if insecure and root_certificates is not None:
         raise ValueError(
@@ -42,16 +62,21 @@ def create_channel(
 
     # Possible options:
     # https://github.com/grpc/grpc/blob/v1.43.x/include/grpc/impl/codegen/grpc_types.h
-    channel_options = [
+    channel_options: List[Tuple[str, Any]] = [
         ("grpc.max_send_message_length", max_message_length),
         ("grpc.max_receive_message_length", max_message_length),
     ]
+    if options is not None:
+        channel_options.extend(options)
 
     if insecure:
         channel = grpc.insecure_channel(server_address, options=channel_options)
         log(DEBUG, "Opened insecure gRPC connection (no certificates were passed)")
     else:
-        ssl_channel_credentials = grpc.ssl_channel_credentials(root_certificates)
+        if isinstance(root_certificates, grpc.ChannelCredentials):
+            ssl_channel_credentials = root_certificates
+        else:
+            ssl_channel_credentials = grpc.ssl_channel_credentials(root_certificates)
         channel = grpc.secure_channel(
             server_address, ssl_channel_credentials, options=channel_options
         )
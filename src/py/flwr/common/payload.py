@@ -0,0 +1,240 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Out-of-band transfer of large payloads via an object store."""
+
+
+import hashlib
+import json
+import sys
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+
+from .constant import MISSING_EXTRA_S3
+from .record import Array, ParametersRecord, RecordSet
+
+PAYLOAD_OFFLOAD_THRESHOLD = 1_048_576  # == 1 * 1024 * 1024
+STYPE_PAYLOAD_REF = "flwr.payload_ref"
+
+
+class PayloadBackend(ABC):
+    """Abstract object store for large payloads.
+
+    Payloads are content-addressed: the key of a payload is the SHA-256 digest of
+    its bytes. `upload` always stores the payload, because the store may have
+    removed an earlier upload (e.g., due to lifecycle rules of the bucket).
+    """
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        """Store `data` under `key`."""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        """Return the data stored under `key`."""
+
+    def upload(self, data: bytes) -> str:
+        """Upload `data` and return its key."""
+        key = hashlib.sha256(data).hexdigest()
+        self.put(key, data)
+        return key
+
+
+class S3PayloadBackend(PayloadBackend):
+    """S3-compatible object store (e.g., AWS S3, MinIO, GCS) based on `boto3`.
+
+    Parameters
+    ----------
+    bucket : str
+        The name of the bucket in which payloads are stored.
+    prefix : str (default: "")
+        A prefix prepended to the key of every payload.
+    client : Optional[Any] (default: None)
+        A `boto3` S3 client. If `None`, a client is created using the default
+        `boto3` configuration (environment variables, `~/.aws/config`, ...).
+    part_size : int (default: 16_777_216, this equals 16MB)
+        The part size of multipart uploads and downloads.
+    max_concurrency : int (default: 8)
+        The maximum number of parts transferred in parallel.
+    """
+
+    # pylint: disable-next=too-many-arguments
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        client: Optional[Any] = None,
+        part_size: int = 16_777_216,
+        max_concurrency: int = 8,
+    ) -> None:
+        try:
+            # pylint: disable-next=import-outside-toplevel
+            import boto3
+            from boto3.s3.transfer import (  # pylint: disable=import-outside-toplevel
+                TransferConfig,
+            )
+        except ModuleNotFoundError:
+            sys.exit(MISSING_EXTRA_S3)
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = client if client is not None else boto3.client("s3")
+        self.transfer_config = TransferConfig(
+            multipart_threshold=part_size,
+            multipart_chunksize=part_size,
+            max_concurrency=max_concurrency,
+        )
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store `data` under `key`."""
+        self.client.upload_fileobj(
+            BytesIO(data),
+            self.bucket,
+            self.prefix + key,
+            Config=self.transfer_config,
+        )
+
+    def get(self, key: str) -> bytes:
+        """Return the data stored under `key`."""
+        buffer = BytesIO()
+        self.client.download_fileobj(
+            self.bucket,
+            self.prefix + key,
+            buffer,
+            Config=self.transfer_config,
+        )
+        return buffer.getvalue()
+
+
+def offload_payloads(  # pylint: disable=R0914
+    recordset: RecordSet,
+    backend: PayloadBackend,
+    threshold: int = PAYLOAD_OFFLOAD_THRESHOLD,
+    max_workers: int = 8,
+    uploaded: Optional[Dict[int, Tuple[bytes, str]]] = None,
+) -> RecordSet:
+    """Upload large arrays to `backend` and replace them with references.
+
+    Every `Array` whose data is larger than `threshold` bytes is uploaded and
+    replaced in the returned `RecordSet` by a small reference `Array` of stype
+    `STYPE_PAYLOAD_REF`. The input `RecordSet` is not modified.
+
+    `uploaded` maps the `id` of data that was already uploaded to the data and its
+    key, and is updated in place. Passing the same dictionary to all calls that
+    send the same arrays (e.g., when broadcasting a model to many nodes) uploads
+    and hashes every array only once.
+    """
+    # Collect all arrays that need to be offloaded
+    arrays: List[Tuple[str, str, Array]] = [
+        (record_name, array_name, array)
+        for record_name, record in recordset.parameters_records.items()
+        for array_name, array in record.items()
+        if array.stype != STYPE_PAYLOAD_REF and len(array.data) > threshold
+    ]
+    if not arrays:
+        return recordset
+
+    # Upload data that was not uploaded before in parallel, each object only once
+    if uploaded is None:
+        uploaded = {}
+    pending: Dict[int, bytes] = {
+        id(array.data): array.data
+        for _, _, array in arrays
+        if id(array.data) not in uploaded
+    }
+    if pending:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            keys = list(executor.map(backend.upload, pending.values()))
+        # Keep a reference to the data so that its `id` is not reused
+        for data, key in zip(pending.values(), keys):
+            uploaded[id(data)] = (data, key)
+
+    refs: Dict[Tuple[str, str], Array] = {}
+    for record_name, array_name, array in arrays:
+        key = uploaded[id(array.data)][1]
+        ref = {"key": key, "size": len(array.data), "stype": array.stype}
+        refs[(record_name, array_name)] = Array(
+            dtype=array.dtype,
+            shape=array.shape,
+            stype=STYPE_PAYLOAD_REF,
+            data=json.dumps(ref).encode("utf-8"),
+        )
+    return _replace_arrays(recordset, refs)
+
+
+def restore_payloads(
+    recordset: RecordSet,
+    backend: PayloadBackend,
+    max_workers: int = 8,
+) -> RecordSet:
+    """Download the arrays referenced in `recordset` from `backend`.
+
+    This reverses `offload_payloads`. The integrity of every downloaded array is
+    verified against the SHA-256 digest stored in its reference. The input
+    `RecordSet` is not modified.
+    """
+    # Collect all references
+    arrays: List[Tuple[str, str, Array]] = [
+        (record_name, array_name, array)
+        for record_name, record in recordset.parameters_records.items()
+        for array_name, array in record.items()
+        if array.stype == STYPE_PAYLOAD_REF
+    ]
+    if not arrays:
+        return recordset
+
+    # Download in parallel
+    refs = [json.loads(array.data.decode("utf-8")) for _, _, array in arrays]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        blobs = list(executor.map(lambda ref: backend.get(ref["key"]), refs))
+
+    restored: Dict[Tuple[str, str], Array] = {}
+    for (record_name, array_name, array), ref, data in zip(arrays, refs, blobs):
+        if len(data) != ref["size"] or hashlib.sha256(data).hexdigest() != ref["key"]:
+            raise ValueError(
+                f"Payload `{ref['key']}` of array `{array_name}` is corrupted."
+            )
+        restored[(record_name, array_name)] = Array(
+            dtype=array.dtype,
+            shape=array.shape,
+            stype=ref["stype"],
+            data=data,
+        )
+    return _replace_arrays(recordset, restored)
+
+
+def _replace_arrays(
+    recordset: RecordSet, arrays: Dict[Tuple[str, str], Array]
+) -> RecordSet:
+    """Return a copy of `recordset` in which the given arrays are replaced."""
+    record_names = {record_name for record_name, _ in arrays}
+    parameters_records: Dict[str, ParametersRecord] = {}
+    for record_name, record in recordset.parameters_records.items():
+        if record_name not in record_names:
+            parameters_records[record_name] = record
+            continue
+        parameters_records[record_name] = ParametersRecord(
+            OrderedDict(
+                (array_name, arrays.get((record_name, array_name), array))
+                for array_name, array in record.items()
+            )
+        )
+    return RecordSet(
+        parameters_records=parameters_records,
+        metrics_records=dict(recordset.metrics_records),
+        configs_records=dict(recordset.configs_records),
+    )
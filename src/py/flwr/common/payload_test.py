@@ -0,0 +1,219 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for out-of-band payload transfer."""
+
+
+import json
+import sys
+from collections import OrderedDict
+from io import BytesIO
+from typing import Any, Dict, Tuple
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from .payload import (
+    STYPE_PAYLOAD_REF,
+    PayloadBackend,
+    S3PayloadBackend,
+    offload_payloads,
+    restore_payloads,
+)
+from .record import ConfigsRecord, ParametersRecord, RecordSet, array_from_numpy
+
+
+class InMemoryPayloadBackend(PayloadBackend):
+    """Payload backend storing payloads in a dictionary."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.store: Dict[str, bytes] = {}
+        self.num_puts = 0
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store `data` under `key`."""
+        self.store[key] = data
+        self.num_puts += 1
+
+    def get(self, key: str) -> bytes:
+        """Return the data stored under `key`."""
+        return self.store[key]
+
+
+def _make_recordset() -> RecordSet:
+    return RecordSet(
+        parameters_records={
+            "params": ParametersRecord(
+                OrderedDict(
+                    [
+                        ("large", array_from_numpy(np.ones((64, 64)))),
+                        ("small", array_from_numpy(np.ones(2))),
+                    ]
+                )
+            )
+        },
+        configs_records={"config": ConfigsRecord({"lr": 0.1})},
+    )
+
+
+def test_offload_and_restore() -> None:
+    """Test that large arrays are replaced by references and restored."""
+    # Prepare
+    backend = InMemoryPayloadBackend()
+    recordset = _make_recordset()
+
+    # Execute
+    offloaded = offload_payloads(recordset, backend, threshold=1024)
+    restored = restore_payloads(offloaded, backend)
+
+    # Assert
+    params = offloaded.parameters_records["params"]
+    assert params["large"].stype == STYPE_PAYLOAD_REF
+    assert params["small"] == recordset.parameters_records["params"]["small"]
+    assert len(backend.store) == 1
+    assert restored.parameters_records["params"]["large"] == (
+        recordset.parameters_records["params"]["large"]
+    )
+    assert restored.configs_records == recordset.configs_records
+    # The input RecordSet must not be modified
+    assert recordset.parameters_records["params"]["large"].stype != STYPE_PAYLOAD_REF
+
+
+def test_offload_uploads_once() -> None:
+    """Test that the same payload is only uploaded once with a shared cache."""
+    # Prepare
+    backend = InMemoryPayloadBackend()
+    recordset = _make_recordset()
+    uploaded: Dict[int, Tuple[bytes, str]] = {}
+
+    # Execute
+    first = offload_payloads(recordset, backend, threshold=1024, uploaded=uploaded)
+    second = offload_payloads(recordset, backend, threshold=1024, uploaded=uploaded)
+
+    # Assert
+    assert backend.num_puts == 1
+    assert first.parameters_records == second.parameters_records
+
+
+def test_offload_uploads_again_without_cache() -> None:
+    """Test that payloads are uploaded again, in case the store removed them."""
+    # Prepare
+    backend = InMemoryPayloadBackend()
+    recordset = _make_recordset()
+
+    # Execute
+    offload_payloads(recordset, backend, threshold=1024)
+    backend.store.clear()
+    offloaded = offload_payloads(recordset, backend, threshold=1024)
+    restored = restore_payloads(offloaded, backend)
+
+    # Assert
+    assert backend.num_puts == 2
+    assert restored.parameters_records["params"]["large"] == (
+        recordset.parameters_records["params"]["large"]
+    )
+
+
+def test_offload_below_threshold() -> None:
+    """Test that a RecordSet without large arrays is returned as is."""
+    # Prepare
+    backend = InMemoryPayloadBackend()
+    recordset = _make_recordset()
+
+    # Execute
+    offloaded = offload_payloads(recordset, backend)
+
+    # Assert
+    assert offloaded is recordset
+    assert not backend.store
+
+
+def test_restore_corrupted_payload() -> None:
+    """Test that corrupted payloads are detected."""
+    # Prepare
+    backend = InMemoryPayloadBackend()
+    offloaded = offload_payloads(_make_recordset(), backend, threshold=1024)
+    key = next(iter(backend.store))
+    backend.store[key] = b"corrupted"
+
+    # Execute & Assert
+    with pytest.raises(ValueError):
+        restore_payloads(offloaded, backend)
+
+
+def test_s3_payload_backend() -> None:
+    """Test S3PayloadBackend with a stubbed `boto3` client."""
+    # Prepare
+    objects: Dict[str, bytes] = {}
+
+    def upload_fileobj(fileobj: BytesIO, bucket: str, key: str, **_: Any) -> None:
+        objects[f"{bucket}/{key}"] = fileobj.read()
+
+    def download_fileobj(bucket: str, key: str, fileobj: BytesIO, **_: Any) -> None:
+        fileobj.write(objects[f"{bucket}/{key}"])
+
+    client = MagicMock()
+    client.upload_fileobj.side_effect = upload_fileobj
+    client.download_fileobj.side_effect = download_fileobj
+    boto3 = MagicMock()
+    modules = {
+        "boto3": boto3,
+        "boto3.s3": boto3.s3,
+        "boto3.s3.transfer": boto3.s3.transfer,
+    }
+    recordset = _make_recordset()
+
+    # Execute
+    with patch.dict(sys.modules, modules):
+        backend = S3PayloadBackend(
+            bucket="bucket", prefix="flwr/", client=client, part_size=1024
+        )
+        offloaded = offload_payloads(recordset, backend, threshold=1024)
+        restored = restore_payloads(offloaded, backend)
+
+    # Assert
+    key = json.loads(offloaded.parameters_records["params"]["large"].data)["key"]
+    assert list(objects) == [f"bucket/flwr/{key}"]
+    boto3.client.assert_not_called()
+    boto3.s3.transfer.TransferConfig.assert_called_once_with(
+        multipart_threshold=1024, multipart_chunksize=1024, max_concurrency=8
+    )
+    for call in client.upload_fileobj.call_args_list + (
+        client.download_fileobj.call_args_list
+    ):
+        assert call.kwargs["Config"] is backend.transfer_config
+    assert restored.parameters_records["params"]["large"] == (
+        recordset.parameters_records["params"]["large"]
+    )
+
+
+def test_s3_payload_backend_default_client() -> None:
+    """Test that S3PayloadBackend creates a `boto3` client if none is given."""
+    # Prepare
+    boto3 = MagicMock()
+    modules = {
+        "boto3": boto3,
+        "boto3.s3": boto3.s3,
+        "boto3.s3.transfer": boto3.s3.transfer,
+    }
+
+    # Execute
+    with patch.dict(sys.modules, modules):
+        backend = S3PayloadBackend(bucket="bucket")
+
+    # Assert
+    boto3.client.assert_called_once_with("s3")
+    assert backend.client is boto3.client.return_value
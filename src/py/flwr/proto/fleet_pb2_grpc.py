@@ -34,6 +34,11 @@ class FleetStub(object):
                 request_serializer=flwr_dot_proto_dot_fleet__pb2.PullTaskInsRequest.SerializeToString,
                 response_deserializer=flwr_dot_proto_dot_fleet__pb2.PullTaskInsResponse.FromString,
                 )
+        self.PullTaskInsStream = channel.unary_stream(
+                '/flwr.proto.Fleet/PullTaskInsStream',
+                request_serializer=flwr_dot_proto_dot_fleet__pb2.PullTaskInsRequest.SerializeToString,
+                response_deserializer=flwr_dot_proto_dot_fleet__pb2.PullTaskInsResponse.FromString,
+                )
         self.PushTaskRes = channel.unary_unary(
                 '/flwr.proto.Fleet/PushTaskRes',
                 request_serializer=flwr_dot_proto_dot_fleet__pb2.PushTaskResRequest.SerializeToString,
@@ -71,6 +76,15 @@ class FleetServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def PullTaskInsStream(self, request, context):
+        """Retrieve tasks as soon as they become available
+
+        The stream waits for the next task and closes after yielding it
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def PushTaskRes(self, request, context):
         """Complete one or more tasks, if possible
 
@@ -103,6 +117,11 @@ def add_FleetServicer_to_server(servicer, server):
                     request_deserializer=flwr_dot_proto_dot_fleet__pb2.PullTaskInsRequest.FromString,
                     response_serializer=flwr_dot_proto_dot_fleet__pb2.PullTaskInsResponse.SerializeToString,
             ),
+            'PullTaskInsStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.PullTaskInsStream,
+                    request_deserializer=flwr_dot_proto_dot_fleet__pb2.PullTaskInsRequest.FromString,
+                    response_serializer=flwr_dot_proto_dot_fleet__pb2.PullTaskInsResponse.SerializeToString,
+            ),
             'PushTaskRes': grpc.unary_unary_rpc_method_handler(
                     servicer.PushTaskRes,
                     request_deserializer=flwr_dot_proto_dot_fleet__pb2.PushTaskResRequest.FromString,
@@ -186,6 +205,23 @@ class Fleet(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def PullTaskInsStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/flwr.proto.Fleet/PullTaskInsStream',
+            flwr_dot_proto_dot_fleet__pb2.PullTaskInsRequest.SerializeToString,
+            flwr_dot_proto_dot_fleet__pb2.PullTaskInsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def PushTaskRes(request,
             target,
@@ -5,6 +5,7 @@ isort:skip_file
 import abc
 import flwr.proto.fleet_pb2
 import grpc
+import typing
 
 class FleetStub:
     def __init__(self, channel: grpc.Channel) -> None: ...
@@ -28,6 +29,14 @@ class FleetStub:
     HTTP API path: /api/v1/fleet/pull-task-ins
     """
 
+    PullTaskInsStream: grpc.UnaryStreamMultiCallable[
+        flwr.proto.fleet_pb2.PullTaskInsRequest,
+        flwr.proto.fleet_pb2.PullTaskInsResponse]
+    """Retrieve tasks as soon as they become available
+
+    The stream waits for the next task and closes after yielding it
+    """
+
     PushTaskRes: grpc.UnaryUnaryMultiCallable[
         flwr.proto.fleet_pb2.PushTaskResRequest,
         flwr.proto.fleet_pb2.PushTaskResResponse]
@@ -67,6 +76,17 @@ class FleetServicer(metaclass=abc.ABCMeta):
         """
         pass
 
+    @abc.abstractmethod
+    def PullTaskInsStream(self,
+        request: flwr.proto.fleet_pb2.PullTaskInsRequest,
+        context: grpc.ServicerContext,
+    ) -> typing.Iterator[flwr.proto.fleet_pb2.PullTaskInsResponse]:
+        """Retrieve tasks as soon as they become available
+
+        The stream waits for the next task and closes after yielding it
+        """
+        pass
+
     @abc.abstractmethod
     def PushTaskRes(self,
         request: flwr.proto.fleet_pb2.PushTaskResRequest,
@@ -270,6 +270,7 @@ def run_fleet_api() -> None:
             address=address,
             state_factory=state_factory,
             certificates=certificates,
+            max_streams=args.grpc_rere_fleet_api_max_streams,
         )
         grpc_servers.append(fleet_server)
     else:
@@ -356,6 +357,7 @@ def run_superlink() -> None:
             address=address,
             state_factory=state_factory,
             certificates=certificates,
+            max_streams=args.grpc_rere_fleet_api_max_streams,
         )
         grpc_servers.append(fleet_server)
     elif args.fleet_api_type == TRANSPORT_TYPE_VCE:
@@ -415,11 +417,13 @@ def _run_fleet_api_grpc_rere(
     address: str,
     state_factory: StateFactory,
     certificates: Optional[Tuple[bytes, bytes, bytes]],
+    max_streams: int = 0,
 ) -> grpc.Server:
     """Run Fleet API (gRPC, request-response)."""
     # Create Fleet API gRPC server
     fleet_servicer = FleetServicer(
         state_factory=state_factory,
+        max_streams=max_streams,
     )
     fleet_add_servicer_to_server_fn = add_FleetServicer_to_server
     fleet_grpc_server = generic_create_grpc_server(
@@ -652,6 +656,15 @@ def _add_args_fleet_api(parser: argparse.ArgumentParser) -> None:
         help="Fleet API (gRPC-rere) server address (IPv4, IPv6, or a domain name)",
         default=ADDRESS_FLEET_API_GRPC_RERE,
     )
+    grpc_rere_group.add_argument(
+        "--grpc-rere-fleet-api-max-streams",
+        help="Maximum number of nodes that receive TaskIns over an open "
+        "`PullTaskInsStream` stream. Each stream occupies one of the 1000 concurrent "
+        "RPCs of the Fleet API server, nodes beyond this number poll via "
+        "`PullTaskIns`. By default (0), all nodes poll.",
+        type=int,
+        default=0,
+    )
 
     # Fleet API REST options
     rest_group = parser.add_argument_group("Fleet API (REST) server options", "")
@@ -57,7 +57,7 @@ def _make_task(
     res: Union[GetParametersRes, GetPropertiesRes, FitRes, EvaluateRes]
 ) -> task_pb2.Task:  # pylint: disable=E1101
     if isinstance(res, GetParametersRes):
-        message_type = MessageTypeLegacy.GET_PARAMETERS
+        message_type: str = MessageTypeLegacy.GET_PARAMETERS
         recordset = compat.getparametersres_to_recordset(res, True)
     elif isinstance(res, GetPropertiesRes):
         message_type = MessageTypeLegacy.GET_PROPERTIES
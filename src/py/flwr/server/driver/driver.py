@@ -16,9 +16,13 @@
 
 
 import time
-from typing import Iterable, List, Optional, Tuple
+from copy import copy
+from logging import ERROR
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from flwr.common import DEFAULT_TTL, Message, Metadata, RecordSet
+from flwr.common import DEFAULT_TTL, Error, Message, Metadata, RecordSet
+from flwr.common.logger import log
+from flwr.common.payload import PayloadBackend, offload_payloads, restore_payloads
 from flwr.common.serde import message_from_taskres, message_to_taskins
 from flwr.proto.driver_pb2 import (  # pylint: disable=E0611
     CreateRunRequest,
@@ -48,15 +52,22 @@ class Driver:
             * CA certificate.
             * server certificate.
             * server private key.
+    payload_backend : Optional[PayloadBackend] (default: None)
+        An object store used to transfer large arrays out-of-band. If provided,
+        large arrays in pushed messages are uploaded and replaced by references,
+        and arrays referenced in pulled messages are downloaded. The clients need
+        to use the same object store.
     """
 
     def __init__(
         self,
         driver_service_address: str = DEFAULT_SERVER_ADDRESS_DRIVER,
         root_certificates: Optional[bytes] = None,
+        payload_backend: Optional[PayloadBackend] = None,
     ) -> None:
         self.addr = driver_service_address
         self.root_certificates = root_certificates
+        self.payload_backend = payload_backend
         self.grpc_driver: Optional[GrpcDriver] = None
         self.run_id: Optional[int] = None
         self.node = Node(node_id=0, anonymous=True)
@@ -161,9 +172,17 @@ class Driver:
         grpc_driver, _ = self._get_grpc_driver_and_run_id()
         # Construct TaskIns
         task_ins_list: List[TaskIns] = []
+        uploaded: Dict[int, Tuple[bytes, str]] = {}
         for msg in messages:
             # Check message
             self._check_message(msg)
+            # Upload large payloads, without modifying the message of the caller
+            if self.payload_backend is not None and msg.has_content():
+                content = offload_payloads(
+                    msg.content, self.payload_backend, uploaded=uploaded
+                )
+                msg = copy(msg)
+                msg.content = content
             # Convert Message to TaskIns
             taskins = message_to_taskins(msg)
             # Add to list
@@ -195,6 +214,24 @@ class Driver:
         )
         # Convert TaskRes to Message
         msgs = [message_from_taskres(taskres) for taskres in res.task_res_list]
+        # Download referenced payloads
+        if self.payload_backend is not None:
+            for i, msg in enumerate(msgs):
+                if not msg.has_content():
+                    continue
+                try:
+                    msg.content = restore_payloads(msg.content, self.payload_backend)
+                except Exception as ex:  # pylint: disable=broad-exception-caught
+                    log(ERROR, "Failed to restore payloads", exc_info=ex)
+
+                    # Replace the content by an error
+                    # Reason example: "KeyError:<'payloads/...'>"
+                    reason = f"{type(ex).__name__}:<'{ex}'>"
+                    created_at = msg.metadata.created_at
+                    msgs[i] = Message(
+                        metadata=msg.metadata, error=Error(code=0, reason=reason)
+                    )
+                    msgs[i].metadata.created_at = created_at
         return msgs
 
     def send_and_receive(
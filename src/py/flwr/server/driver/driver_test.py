@@ -17,11 +17,16 @@
 
 import time
 import unittest
+from collections import OrderedDict
 from unittest.mock import Mock, patch
 
-from flwr.common import DEFAULT_TTL, RecordSet
+import numpy as np
+
+from flwr.common import DEFAULT_TTL, ParametersRecord, RecordSet, array_from_numpy
 from flwr.common.message import Error
-from flwr.common.serde import error_to_proto, recordset_to_proto
+from flwr.common.payload import STYPE_PAYLOAD_REF, offload_payloads
+from flwr.common.payload_test import InMemoryPayloadBackend
+from flwr.common.serde import error_to_proto, recordset_from_proto, recordset_to_proto
 from flwr.proto.driver_pb2 import (  # pylint: disable=E0611
     GetNodesRequest,
     PullTaskResRequest,
@@ -116,6 +121,37 @@ class TestDriver(unittest.TestCase):
         for task_ins in args[0].task_ins_list:
             self.assertEqual(task_ins.run_id, 61016)
 
+    def test_push_messages_with_payload_backend(self) -> None:
+        """Test pushing messages with large arrays via a payload backend."""
+        # Prepare
+        mock_response = Mock(task_ids=["id1", "id2"])
+        self.mock_grpc_driver.push_task_ins.return_value = mock_response
+        backend = InMemoryPayloadBackend()
+        self.driver.payload_backend = backend
+        array = array_from_numpy(np.ones((1024, 1024)))
+        content = RecordSet(
+            parameters_records={
+                "params": ParametersRecord(OrderedDict([("large", array)]))
+            }
+        )
+        msgs = [
+            self.driver.create_message(content, "", node_id, "", DEFAULT_TTL)
+            for node_id in [1, 2]
+        ]
+
+        # Execute
+        self.driver.push_messages(msgs)
+        args, _ = self.mock_grpc_driver.push_task_ins.call_args
+
+        # Assert
+        self.assertEqual(backend.num_puts, 1)
+        for msg, task_ins in zip(msgs, args[0].task_ins_list):
+            # The messages of the caller must not be modified
+            self.assertIs(msg.content, content)
+            recordset = recordset_from_proto(task_ins.task.recordset)
+            ref = recordset.parameters_records["params"]["large"]
+            self.assertEqual(ref.stype, STYPE_PAYLOAD_REF)
+
     def test_push_messages_invalid(self) -> None:
         """Test pushing invalid messages."""
         # Prepare
@@ -160,6 +196,52 @@ class TestDriver(unittest.TestCase):
         self.assertEqual(args[0].task_ids, msg_ids)
         self.assertEqual(reply_tos, {"id2", "id3"})
 
+    def test_pull_messages_with_unavailable_payload(self) -> None:
+        """Test that a reply whose payloads cannot be restored becomes an error."""
+        # Prepare
+        backend = InMemoryPayloadBackend()
+        self.driver.payload_backend = backend
+        recordsets = [
+            offload_payloads(
+                RecordSet(
+                    parameters_records={
+                        "params": ParametersRecord(
+                            OrderedDict([("large", array_from_numpy(ndarray))])
+                        )
+                    }
+                ),
+                payload_backend,
+            )
+            # The payloads of the second reply are not in the driver's backend
+            for ndarray, payload_backend in [
+                (np.ones((1024, 1024)), backend),
+                (np.zeros((1024, 1024)), InMemoryPayloadBackend()),
+            ]
+        ]
+        mock_response = Mock()
+        mock_response.task_res_list = [
+            TaskRes(
+                task=Task(
+                    ancestry=[f"id{i}"],
+                    created_at=1.0,
+                    recordset=recordset_to_proto(recordset),
+                )
+            )
+            for i, recordset in enumerate(recordsets)
+        ]
+        self.mock_grpc_driver.pull_task_res.return_value = mock_response
+
+        # Execute
+        msgs = list(self.driver.pull_messages(["id0", "id1"]))
+
+        # Assert
+        restored = msgs[0].content.parameters_records["params"]["large"]
+        self.assertNotEqual(restored.stype, STYPE_PAYLOAD_REF)
+        self.assertTrue(msgs[1].has_error())
+        self.assertTrue(str(msgs[1].error.reason).startswith("KeyError:"))
+        self.assertEqual(msgs[1].metadata.reply_to_message, "id1")
+        self.assertEqual(msgs[1].metadata.created_at, 1.0)
+
     def test_send_and_receive_messages_complete(self) -> None:
         """Test send and receive all messages successfully."""
         # Prepare
@@ -15,7 +15,9 @@
 """Fleet API gRPC request-response servicer."""
 
 
+import threading
 from logging import DEBUG, INFO
+from typing import Generator, Optional
 
 import grpc
 
@@ -38,10 +40,19 @@ from flwr.server.superlink.state import StateFactory
 
 
 class FleetServicer(fleet_pb2_grpc.FleetServicer):
-    """Fleet API servicer."""
+    """Fleet API servicer.
 
-    def __init__(self, state_factory: StateFactory) -> None:
+    Each open `PullTaskInsStream` stream occupies one worker thread of the gRPC
+    server while the node waits for its next TaskIns. At most `max_streams` streams
+    are served at a time, further nodes (and all nodes, if `max_streams` is 0) are
+    told to fall back to polling via `PullTaskIns`.
+    """
+
+    def __init__(self, state_factory: StateFactory, max_streams: int = 0) -> None:
         self.state_factory = state_factory
+        self.stream_slots: Optional[threading.BoundedSemaphore] = (
+            threading.BoundedSemaphore(max_streams) if max_streams > 0 else None
+        )
 
     def CreateNode(
         self, request: CreateNodeRequest, context: grpc.ServicerContext
@@ -81,6 +92,34 @@ class FleetServicer(fleet_pb2_grpc.FleetServicer):
             state=self.state_factory.state(),
         )
 
+    def PullTaskInsStream(
+        self, request: PullTaskInsRequest, context: grpc.ServicerContext
+    ) -> Generator[PullTaskInsResponse, None, None]:
+        """Pull TaskIns as soon as they become available."""
+        log(INFO, "FleetServicer.PullTaskInsStream")
+        stream_slots = self.stream_slots
+        if stream_slots is None:
+            context.abort(
+                grpc.StatusCode.UNIMPLEMENTED, "`PullTaskInsStream` is disabled"
+            )
+            return
+        if not stream_slots.acquire(blocking=False):  # pylint: disable=R1732
+            context.abort(
+                grpc.StatusCode.RESOURCE_EXHAUSTED,
+                "Too many open `PullTaskInsStream` streams",
+            )
+            return
+        try:
+            # Tell the client that the stream is served
+            context.send_initial_metadata(())
+            yield from message_handler.pull_task_ins_stream(
+                request=request,
+                state=self.state_factory.state(),
+                is_active=context.is_active,
+            )
+        finally:
+            stream_slots.release()
+
     def PushTaskRes(
         self, request: PushTaskResRequest, context: grpc.ServicerContext
     ) -> PushTaskResResponse:
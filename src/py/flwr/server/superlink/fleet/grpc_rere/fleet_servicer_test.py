@@ -0,0 +1,99 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for FleetServicer."""
+
+
+import unittest
+from unittest.mock import MagicMock
+
+import grpc
+
+from flwr.proto.fleet_pb2 import PullTaskInsRequest  # pylint: disable=E0611
+from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
+from flwr.proto.task_pb2 import TaskIns  # pylint: disable=E0611
+from flwr.server.superlink.fleet.grpc_rere.fleet_servicer import FleetServicer
+
+REQUEST = PullTaskInsRequest(node=Node(node_id=1, anonymous=False))
+
+
+def create_context() -> MagicMock:
+    """Create a mock of an active gRPC context."""
+    context = MagicMock()
+    context.is_active.return_value = True
+    return context
+
+
+class FleetServicerTestCase(unittest.TestCase):
+    """Test suite for the `PullTaskInsStream` method of FleetServicer."""
+
+    def setUp(self) -> None:
+        """Create a StateFactory mock that always has a TaskIns available."""
+        self.state_factory = MagicMock()
+        self.state_factory.state.return_value.get_task_ins.return_value = [
+            TaskIns(task_id="mock")
+        ]
+
+    def test_pull_task_ins_stream_disabled(self) -> None:
+        """Test that the stream is not served if `max_streams` is 0."""
+        # Prepare
+        servicer = FleetServicer(state_factory=self.state_factory)
+        context = create_context()
+
+        # Execute
+        responses = list(servicer.PullTaskInsStream(REQUEST, context))
+
+        # Assert
+        assert not responses
+        context.abort.assert_called_once()
+        assert context.abort.call_args[0][0] == grpc.StatusCode.UNIMPLEMENTED
+        context.send_initial_metadata.assert_not_called()
+
+    def test_pull_task_ins_stream_exhausted(self) -> None:
+        """Test that no more than `max_streams` streams are served."""
+        # Prepare
+        servicer = FleetServicer(state_factory=self.state_factory, max_streams=1)
+        first_context, second_context = create_context(), create_context()
+        first = servicer.PullTaskInsStream(REQUEST, first_context)
+        response = next(first)
+
+        # Execute
+        responses = list(servicer.PullTaskInsStream(REQUEST, second_context))
+
+        # Assert
+        assert response.task_ins_list[0].task_id == "mock"
+        first_context.abort.assert_not_called()
+        first_context.send_initial_metadata.assert_called_once()
+        assert not responses
+        second_context.abort.assert_called_once()
+        assert (
+            second_context.abort.call_args[0][0] == grpc.StatusCode.RESOURCE_EXHAUSTED
+        )
+        first.close()
+
+    def test_pull_task_ins_stream_releases_slot(self) -> None:
+        """Test that a cancelled stream releases its slot."""
+        # Prepare
+        servicer = FleetServicer(state_factory=self.state_factory, max_streams=1)
+        first = servicer.PullTaskInsStream(REQUEST, create_context())
+        next(first)
+        context = create_context()
+
+        # Execute
+        first.close()
+        responses = list(servicer.PullTaskInsStream(REQUEST, context))
+
+        # Assert
+        assert len(responses) == 1
+        context.abort.assert_not_called()
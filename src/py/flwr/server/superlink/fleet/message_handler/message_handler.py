@@ -16,7 +16,7 @@
 
 
 import time
-from typing import List, Optional
+from typing import Callable, Generator, List, Optional
 from uuid import UUID
 
 from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
@@ -36,6 +36,8 @@ from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
 from flwr.proto.task_pb2 import TaskIns, TaskRes  # pylint: disable=E0611
 from flwr.server.superlink.state import State
 
+PULL_TASK_INS_STREAM_WAIT_TIMEOUT = 1.0
+
 
 def create_node(
     request: CreateNodeRequest,  # pylint: disable=unused-argument
@@ -82,6 +84,37 @@ def pull_task_ins(request: PullTaskInsRequest, state: State) -> PullTaskInsRespo
     return response
 
 
+def pull_task_ins_stream(
+    request: PullTaskInsRequest,
+    state: State,
+    is_active: Callable[[], bool],
+    wait_timeout: float = PULL_TASK_INS_STREAM_WAIT_TIMEOUT,
+) -> Generator[PullTaskInsResponse, None, None]:
+    """Pull TaskIns stream handler.
+
+    Waits until a TaskIns becomes available for the node and yields it as the only
+    response of the stream (long-poll). TaskIns are marked as delivered when they
+    are taken from State, so the stream never takes the next TaskIns while the node
+    still works on the previous one, and a broken stream loses at most the TaskIns
+    that was being sent. `is_active` is checked right before TaskIns are taken from
+    State, and at least every `wait_timeout` seconds while none is available.
+    """
+    # Get node_id if client node is not anonymous
+    node = request.node  # pylint: disable=no-member
+    node_id: Optional[int] = None if node.anonymous else node.node_id
+
+    while is_active():
+        # Retrieve TaskIns from State
+        task_ins_list: List[TaskIns] = state.get_task_ins(node_id=node_id, limit=1)
+        if not task_ins_list:
+            state.wait_for_task_ins(node_id=node_id, timeout=wait_timeout)
+            continue
+
+        # Build response
+        yield PullTaskInsResponse(task_ins_list=task_ins_list)
+        return
+
+
 def push_task_res(request: PushTaskResRequest, state: State) -> PushTaskResResponse:
     """Push TaskRes handler."""
     # pylint: disable=no-member
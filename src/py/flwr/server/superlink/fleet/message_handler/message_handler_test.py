@@ -24,9 +24,17 @@ from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
     PushTaskResRequest,
 )
 from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
-from flwr.proto.task_pb2 import Task, TaskRes  # pylint: disable=E0611
-
-from .message_handler import create_node, delete_node, pull_task_ins, push_task_res
+from flwr.proto.task_pb2 import Task, TaskIns, TaskRes  # pylint: disable=E0611
+from flwr.server.superlink.state import InMemoryState
+from flwr.server.superlink.state.state_test import create_task_ins
+
+from .message_handler import (
+    create_node,
+    delete_node,
+    pull_task_ins,
+    pull_task_ins_stream,
+    push_task_res,
+)
 
 
 def test_create_node() -> None:
@@ -101,6 +109,72 @@ def test_pull_task_ins() -> None:
     state.get_task_res.assert_not_called()
 
 
+def test_pull_task_ins_stream() -> None:
+    """Test pull_task_ins_stream."""
+    # Prepare
+    request = PullTaskInsRequest(node=Node(node_id=1, anonymous=False))
+    state = MagicMock()
+    state.get_task_ins.side_effect = [[], [TaskIns(task_id="mock")]]
+    is_active = MagicMock(side_effect=[True, True, False])
+
+    # Execute
+    responses = list(
+        pull_task_ins_stream(request=request, state=state, is_active=is_active)
+    )
+
+    # Assert
+    assert len(responses) == 1
+    assert responses[0].task_ins_list[0].task_id == "mock"
+    assert state.get_task_ins.call_count == 2
+    state.wait_for_task_ins.assert_called_once_with(node_id=1, timeout=1.0)
+    state.create_node.assert_not_called()
+    state.delete_node.assert_not_called()
+    state.store_task_ins.assert_not_called()
+    state.store_task_res.assert_not_called()
+    state.get_task_res.assert_not_called()
+
+
+def test_pull_task_ins_stream_inactive() -> None:
+    """Test that pull_task_ins_stream takes no TaskIns for an inactive stream."""
+    # Prepare
+    request = PullTaskInsRequest(node=Node(node_id=1, anonymous=False))
+    state = MagicMock()
+    is_active = MagicMock(return_value=False)
+
+    # Execute
+    responses = list(
+        pull_task_ins_stream(request=request, state=state, is_active=is_active)
+    )
+
+    # Assert
+    assert not responses
+    state.get_task_ins.assert_not_called()
+    state.wait_for_task_ins.assert_not_called()
+
+
+def test_pull_task_ins_stream_long_poll() -> None:
+    """Test that pull_task_ins_stream takes one TaskIns and leaves the rest."""
+    # Prepare
+    state = InMemoryState()
+    node_id = state.create_node()
+    run_id = state.create_run()
+    task_ids = [
+        state.store_task_ins(create_task_ins(node_id, anonymous=False, run_id=run_id))
+        for _ in range(2)
+    ]
+    request = PullTaskInsRequest(node=Node(node_id=node_id, anonymous=False))
+
+    # Execute
+    stream = pull_task_ins_stream(request=request, state=state, is_active=lambda: True)
+    response = next(stream)
+    stream.close()
+
+    # Assert
+    assert response.task_ins_list[0].task_id == str(task_ids[0])
+    pending = state.get_task_ins(node_id=node_id, limit=None)
+    assert [task_ins.task_id for task_ins in pending] == [str(task_ids[1])]
+
+
 def test_push_task_res() -> None:
     """Test push_task_res."""
     # Prepare
@@ -93,7 +93,8 @@ async def worker(
         except Exception as ex:  # pylint: disable=broad-exception-caught
             log(ERROR, ex)
             log(ERROR, traceback.format_exc())
-            reason = str(type(ex)) + ":<'" + str(ex) + "'>"
+            # Reason example: "ZeroDivisionError:<'division by zero'>"
+            reason = f"{type(ex).__name__}:<'{ex}'>"
             error = Error(code=0, reason=reason)
             out_mssg = message.create_error_reply(error=error)
 
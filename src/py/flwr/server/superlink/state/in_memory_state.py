@@ -15,11 +15,13 @@
 """In-memory State implementation."""
 
 
+import heapq
 import os
 import threading
 import time
+from collections import defaultdict, deque
 from logging import ERROR
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Deque, Dict, List, Optional, Set, Tuple
 from uuid import UUID, uuid4
 
 from flwr.common import log, now
@@ -28,22 +30,42 @@ from flwr.server.superlink.state.state import State
 from flwr.server.utils import validate_task_ins_or_res
 
 
-class InMemoryState(State):
+class InMemoryState(State):  # pylint: disable=R0902
     """In-memory State implementation."""
 
     def __init__(self) -> None:
         # Map node_id to (online_until, ping_interval)
         self.node_ids: Dict[int, Tuple[float, float]] = {}
+        # Min-heap of (online_until, node_id), entries of re-pinged or deleted
+        # nodes are left in place and skipped when they expire
+        self.node_expiry: List[Tuple[float, int]] = []
+        self.online_node_ids: Set[int] = set()
         self.run_ids: Set[int] = set()
-        self.task_ins_store: Dict[UUID, TaskIns] = {}
-        self.task_res_store: Dict[UUID, TaskRes] = {}
-        self.lock = threading.Lock()
+        # TaskIns and TaskRes are keyed by the bytes of their task_id, and kept
+        # in separate maps before and after they are delivered
+        self.pending_task_ins: Dict[bytes, TaskIns] = {}
+        self.delivered_task_ins: Dict[bytes, TaskIns] = {}
+        self.pending_task_res: Dict[bytes, TaskRes] = {}
+        self.delivered_task_res: Dict[bytes, TaskRes] = {}
+        # IDs of undelivered TaskIns, in order of arrival, per consumer node
+        self.pending_by_node: Dict[int, Deque[bytes]] = defaultdict(deque)
+        self.pending_anon: Deque[bytes] = deque()
+        # Streams waiting for TaskIns, with their number, per consumer node
+        self.task_ins_conditions: Dict[Optional[int], threading.Condition] = {}
+        self.task_ins_waiters: Dict[Optional[int], int] = {}
+        # Map the task_id of a TaskIns to the task_ids of the TaskRes replying to it
+        self.ancestry_index: Dict[bytes, Set[bytes]] = defaultdict(set)
+        # One lock per store, locks are always acquired in this order
+        self.task_ins_lock = threading.Lock()
+        self.task_res_lock = threading.Lock()
+        self.nodes_lock = threading.Lock()
+        self.runs_lock = threading.Lock()
 
     def store_task_ins(self, task_ins: TaskIns) -> Optional[UUID]:
         """Store one TaskIns."""
         # Validate task
         errors = validate_task_ins_or_res(task_ins)
-        if any(errors):
+        if errors:
             log(ERROR, errors)
             return None
         # Validate run_id
@@ -56,8 +78,23 @@ class InMemoryState(State):
 
         # Store TaskIns
         task_ins.task_id = str(task_id)
-        with self.lock:
-            self.task_ins_store[task_id] = task_ins
+        key = task_id.bytes
+        consumer = task_ins.task.consumer
+        anonymous, consumer_node_id = consumer.anonymous, consumer.node_id
+        pending_task_ins = self.pending_task_ins
+        with self.task_ins_lock:
+            pending_task_ins[key] = task_ins
+            if anonymous:
+                self.pending_anon.append(key)
+            else:
+                self.pending_by_node[consumer_node_id].append(key)
+
+            # Wake up a stream waiting for this TaskIns, if any
+            condition = self.task_ins_conditions.get(
+                None if anonymous else consumer_node_id
+            )
+            if condition is not None:
+                condition.notify()
 
         # Return the new task_id
         return task_id
@@ -69,39 +106,72 @@ class InMemoryState(State):
         if limit is not None and limit < 1:
             raise AssertionError("`limit` must be >= 1")
 
-        # Find TaskIns for node_id that were not delivered yet
+        if node_id is None:
+            pending: Optional[Deque[bytes]] = self.pending_anon
+        else:
+            pending = self.pending_by_node.get(node_id)
+
+        # Return early if there is nothing to deliver, which is the common case
+        # for nodes polling for TaskIns
+        if not pending:
+            return []
+
+        # Take TaskIns for node_id that were not delivered yet
         task_ins_list: List[TaskIns] = []
-        with self.lock:
-            for _, task_ins in self.task_ins_store.items():
-                # pylint: disable=too-many-boolean-expressions
-                if (
-                    node_id is not None  # Not anonymous
-                    and task_ins.task.consumer.anonymous is False
-                    and task_ins.task.consumer.node_id == node_id
-                    and task_ins.task.delivered_at == ""
-                ) or (
-                    node_id is None  # Anonymous
-                    and task_ins.task.consumer.anonymous is True
-                    and task_ins.task.consumer.node_id == 0
-                    and task_ins.task.delivered_at == ""
-                ):
+        remaining = -1 if limit is None else limit
+        with self.task_ins_lock:
+            while pending and remaining != 0:
+                key = pending.popleft()
+                task_ins = self.pending_task_ins.pop(key, None)
+                # Skip TaskIns that were deleted in the meantime
+                if task_ins is not None:
+                    self.delivered_task_ins[key] = task_ins
                     task_ins_list.append(task_ins)
-                if limit and len(task_ins_list) == limit:
-                    break
+                    remaining -= 1
+
+            # Drop the queue of a node once it is drained
+            if not pending and node_id is not None:
+                if self.pending_by_node.get(node_id) is pending:
+                    del self.pending_by_node[node_id]
 
-        # Mark all of them as delivered
-        delivered_at = now().isoformat()
-        for task_ins in task_ins_list:
-            task_ins.task.delivered_at = delivered_at
+            # Mark all of them as delivered
+            if task_ins_list:
+                delivered_at = now().isoformat()
+                for task_ins in task_ins_list:
+                    task_ins.task.delivered_at = delivered_at
 
         # Return TaskIns
         return task_ins_list
 
+    def wait_for_task_ins(self, node_id: Optional[int], timeout: float) -> None:
+        """Wait until TaskIns may be available for node_id."""
+        with self.task_ins_lock:
+            if node_id is None:
+                pending: Optional[Deque[bytes]] = self.pending_anon
+            else:
+                pending = self.pending_by_node.get(node_id)
+            if pending:
+                return
+
+            condition = self.task_ins_conditions.get(node_id)
+            if condition is None:
+                condition = threading.Condition(self.task_ins_lock)
+                self.task_ins_conditions[node_id] = condition
+            self.task_ins_waiters[node_id] = self.task_ins_waiters.get(node_id, 0) + 1
+            try:
+                condition.wait(timeout)
+            finally:
+                # Drop the condition once no stream waits on it anymore
+                self.task_ins_waiters[node_id] -= 1
+                if self.task_ins_waiters[node_id] == 0:
+                    del self.task_ins_waiters[node_id]
+                    del self.task_ins_conditions[node_id]
+
     def store_task_res(self, task_res: TaskRes) -> Optional[UUID]:
         """Store one TaskRes."""
         # Validate task
         errors = validate_task_ins_or_res(task_res)
-        if any(errors):
+        if errors:
             log(ERROR, errors)
             return None
 
@@ -113,10 +183,17 @@ class InMemoryState(State):
         # Create task_id
         task_id = uuid4()
 
+        # The TaskRes is indexed by the task_id of the TaskIns it replies to
+        task_ins_key = _uuid_bytes(task_res.task.ancestry[0])
+
         # Store TaskRes
         task_res.task_id = str(task_id)
-        with self.lock:
-            self.task_res_store[task_id] = task_res
+        key = task_id.bytes
+        pending_task_res = self.pending_task_res
+        with self.task_res_lock:
+            pending_task_res[key] = task_res
+            if task_ins_key is not None:
+                self.ancestry_index[task_ins_key].add(key)
 
         # Return the new task_id
         return task_id
@@ -126,82 +203,103 @@ class InMemoryState(State):
         if limit is not None and limit < 1:
             raise AssertionError("`limit` must be >= 1")
 
-        with self.lock:
+        remaining = -1 if limit is None else limit
+        with self.task_res_lock:
             # Find TaskRes that were not delivered yet
             task_res_list: List[TaskRes] = []
-            for _, task_res in self.task_res_store.items():
-                if (
-                    UUID(task_res.task.ancestry[0]) in task_ids
-                    and task_res.task.delivered_at == ""
-                ):
-                    task_res_list.append(task_res)
-                if limit and len(task_res_list) == limit:
+            for task_ins_id in task_ids:
+                if remaining == 0:
                     break
+                for task_res_key in self.ancestry_index.get(task_ins_id.bytes, ()):
+                    task_res = self.pending_task_res.pop(task_res_key, None)
+                    if task_res is not None:
+                        self.delivered_task_res[task_res_key] = task_res
+                        task_res_list.append(task_res)
+                        remaining -= 1
+                        if remaining == 0:
+                            break
 
             # Mark all of them as delivered
-            delivered_at = now().isoformat()
-            for task_res in task_res_list:
-                task_res.task.delivered_at = delivered_at
+            if task_res_list:
+                delivered_at = now().isoformat()
+                for task_res in task_res_list:
+                    task_res.task.delivered_at = delivered_at
 
             # Return TaskRes
             return task_res_list
 
     def delete_tasks(self, task_ids: Set[UUID]) -> None:
         """Delete all delivered TaskIns/TaskRes pairs."""
-        task_ins_to_be_deleted: Set[UUID] = set()
-        task_res_to_be_deleted: Set[UUID] = set()
-
-        with self.lock:
-            for task_ins_id in task_ids:
-                # Find the task_id of the matching task_res
-                for task_res_id, task_res in self.task_res_store.items():
-                    if UUID(task_res.task.ancestry[0]) != task_ins_id:
-                        continue
-                    if task_res.task.delivered_at == "":
-                        continue
-
-                    task_ins_to_be_deleted.add(task_ins_id)
-                    task_res_to_be_deleted.add(task_res_id)
-
-            for task_id in task_ins_to_be_deleted:
-                del self.task_ins_store[task_id]
-            for task_id in task_res_to_be_deleted:
-                del self.task_res_store[task_id]
+        with self.task_ins_lock, self.task_res_lock:
+            for task_id in task_ids:
+                task_ins_key = task_id.bytes
+                task_res_keys = self.ancestry_index.get(task_ins_key)
+                if not task_res_keys:
+                    continue
+
+                # Delete the delivered TaskRes replying to this TaskIns
+                delivered = [
+                    key
+                    for key in task_res_keys
+                    if self.delivered_task_res.pop(key, None) is not None
+                ]
+                if not delivered:
+                    continue
+
+                # Delete the TaskIns
+                if self.delivered_task_ins.pop(task_ins_key, None) is None:
+                    self.pending_task_ins.pop(task_ins_key, None)
+
+                task_res_keys.difference_update(delivered)
+                if not task_res_keys:
+                    del self.ancestry_index[task_ins_key]
 
     def num_task_ins(self) -> int:
         """Calculate the number of task_ins in store.
 
-        This includes delivered but not yet deleted task_ins.
+        This includes delivered but not yet deleted task_ins. The store is not locked,
+        so the count can be off while task_ins are stored, delivered, or deleted
+        concurrently.
         """
-        return len(self.task_ins_store)
+        return len(self.pending_task_ins) + len(self.delivered_task_ins)
 
     def num_task_res(self) -> int:
         """Calculate the number of task_res in store.
 
-        This includes delivered but not yet deleted task_res.
+        This includes delivered but not yet deleted task_res. The store is not locked,
+        so the count can be off while task_res are stored, delivered, or deleted
+        concurrently.
         """
-        return len(self.task_res_store)
+        return len(self.pending_task_res) + len(self.delivered_task_res)
 
     def create_node(self) -> int:
         """Create, store in state, and return `node_id`."""
         # Sample a random int64 as node_id
-        node_id: int = int.from_bytes(os.urandom(8), "little", signed=True)
-
-        with self.lock:
-            if node_id not in self.node_ids:
-                # Default ping interval is 30s
-                # TODO: change 1e9 to 30s  # pylint: disable=W0511
-                self.node_ids[node_id] = (time.time() + 1e9, 1e9)
+        node_id: int = _random_int64()
+
+        # Default ping interval is 30s
+        # TODO: change 1e9 to 30s  # pylint: disable=W0511
+        ping_interval = 1e9
+        online_until = time.time() + ping_interval
+
+        entry = (online_until, ping_interval)
+        with self.nodes_lock:
+            # `setdefault` returns our own entry only if `node_id` was unused
+            if self.node_ids.setdefault(node_id, entry) is entry:
+                self._mark_online(node_id, online_until)
                 return node_id
         log(ERROR, "Unexpected node registration failure.")
         return 0
 
     def delete_node(self, node_id: int) -> None:
         """Delete a client node."""
-        with self.lock:
+        with self.task_ins_lock, self.nodes_lock:
             if node_id not in self.node_ids:
                 raise ValueError(f"Node {node_id} not found")
             del self.node_ids[node_id]
+            self.online_node_ids.discard(node_id)
+            # TaskIns can no longer be delivered to the deleted node
+            self.pending_by_node.pop(node_id, None)
 
     def get_nodes(self, run_id: int) -> Set[int]:
         """Return all available client nodes.
@@ -211,32 +309,71 @@ class InMemoryState(State):
         If the provided `run_id` does not exist or has no matching nodes,
         an empty `Set` MUST be returned.
         """
-        with self.lock:
-            if run_id not in self.run_ids:
-                return set()
-            current_time = time.time()
-            return {
-                node_id
-                for node_id, (online_until, _) in self.node_ids.items()
-                if online_until > current_time
-            }
+        if run_id not in self.run_ids:
+            return set()
+
+        current_time = time.time()
+        with self.nodes_lock:
+            # Mark nodes whose `online_until` has passed as offline
+            expiry = self.node_expiry
+            while expiry and expiry[0][0] <= current_time:
+                online_until, node_id = heapq.heappop(expiry)
+                entry = self.node_ids.get(node_id)
+                if entry is not None and entry[0] == online_until:
+                    self.online_node_ids.discard(node_id)
+            return set(self.online_node_ids)
 
     def create_run(self) -> int:
         """Create one run."""
         # Sample a random int64 as run_id
-        with self.lock:
-            run_id: int = int.from_bytes(os.urandom(8), "little", signed=True)
+        run_id: int = _random_int64()
 
-            if run_id not in self.run_ids:
-                self.run_ids.add(run_id)
+        run_ids = self.run_ids
+        with self.runs_lock:
+            if run_id not in run_ids:
+                run_ids.add(run_id)
                 return run_id
         log(ERROR, "Unexpected run creation failure.")
         return 0
 
     def acknowledge_ping(self, node_id: int, ping_interval: float) -> bool:
         """Acknowledge a ping received from a node, serving as a heartbeat."""
-        with self.lock:
+        online_until = time.time() + ping_interval
+        with self.nodes_lock:
             if node_id in self.node_ids:
-                self.node_ids[node_id] = (time.time() + ping_interval, ping_interval)
+                self._set_online_until(node_id, online_until, ping_interval)
                 return True
         return False
+
+    def _set_online_until(
+        self, node_id: int, online_until: float, ping_interval: float
+    ) -> None:
+        """Mark a node as online until `online_until`, hold `nodes_lock`."""
+        self.node_ids[node_id] = (online_until, ping_interval)
+        self._mark_online(node_id, online_until)
+
+    def _mark_online(self, node_id: int, online_until: float) -> None:
+        """Track `node_id` as online until `online_until`, hold `nodes_lock`."""
+        self.online_node_ids.add(node_id)
+        heapq.heappush(self.node_expiry, (online_until, node_id))
+
+        # Drop stale entries once they make up most of the heap
+        if len(self.node_expiry) > 2 * len(self.node_ids) + 64:
+            self.node_expiry = [
+                (until, node_id) for node_id, (until, _) in self.node_ids.items()
+            ]
+            heapq.heapify(self.node_expiry)
+
+
+def _uuid_bytes(value: str) -> Optional[bytes]:
+    """Return the bytes of a UUID string, or None if it is not a valid UUID."""
+    try:
+        return UUID(value).bytes
+    except ValueError:
+        return None
+
+
+def _random_int64() -> int:
+    """Sample a random signed 64-bit integer."""
+    # Node IDs identify nodes on the Fleet API, keep them unpredictable
+    return int.from_bytes(os.urandom(8), "little", signed=True)
@@ -190,7 +190,7 @@ class SqliteState(State):
         """
         # Validate task
         errors = validate_task_ins_or_res(task_ins)
-        if any(errors):
+        if errors:
             log(ERROR, errors)
             return None
 
@@ -303,6 +303,38 @@ class SqliteState(State):
 
         return result
 
+    def wait_for_task_ins(self, node_id: Optional[int], timeout: float) -> None:
+        """Wait until TaskIns may be available for node_id.
+
+        SqliteState is not notified of TaskIns stored through other connections to the
+        database, so this waits for the full `timeout` unless TaskIns are pending
+        already.
+        """
+        data: Dict[str, Union[str, int]] = {}
+        if node_id is None:
+            query = """
+                SELECT task_id
+                FROM task_ins
+                WHERE consumer_anonymous == 1
+                AND   consumer_node_id == 0
+                AND   delivered_at = ""
+                LIMIT 1;
+            """
+        else:
+            query = """
+                SELECT task_id
+                FROM task_ins
+                WHERE consumer_anonymous == 0
+                AND   consumer_node_id == :node_id
+                AND   delivered_at = ""
+                LIMIT 1;
+            """
+            data["node_id"] = node_id
+
+        if self.query(query, data):
+            return
+        time.sleep(timeout)
+
     def store_task_res(self, task_res: TaskRes) -> Optional[UUID]:
         """Store one TaskRes.
 
@@ -321,7 +353,7 @@ class SqliteState(State):
         """
         # Validate task
         errors = validate_task_ins_or_res(task_res)
-        if any(errors):
+        if errors:
             log(ERROR, errors)
             return None
 
@@ -75,6 +75,18 @@ class State(abc.ABC):
         `limit` is set, it has to be greater zero.
         """
 
+    @abc.abstractmethod
+    def wait_for_task_ins(self, node_id: Optional[int], timeout: float) -> None:
+        """Wait until TaskIns may be available for node_id.
+
+        Usually, the Fleet API calls this for Nodes that keep a stream open to receive
+        TaskIns as soon as they are stored.
+
+        Returns as soon as a TaskIns for `node_id` is stored (or already is), and at
+        the latest after `timeout` seconds. Returning does not guarantee that a
+        subsequent call to `get_task_ins` returns a TaskIns.
+        """
+
     @abc.abstractmethod
     def store_task_res(self, task_res: TaskRes) -> Optional[UUID]:
         """Store one TaskRes.
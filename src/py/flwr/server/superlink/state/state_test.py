@@ -16,11 +16,12 @@
 # pylint: disable=invalid-name, disable=R0904
 
 import tempfile
+import threading
 import time
 import unittest
 from abc import abstractmethod
 from datetime import datetime, timezone
-from typing import List
+from typing import Dict, List, Set
 from unittest.mock import patch
 from uuid import uuid4
 
@@ -234,6 +235,48 @@ class StateTest(unittest.TestCase):
         retrieved_task_ins = task_ins_list[0]
         assert retrieved_task_ins.task_id == str(task_ins_uuid)
 
+    def test_task_ins_store_multiple_nodes_and_retrieve_with_limit(self) -> None:
+        """Store TaskIns for two nodes and retrieve them in batches."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        task_ids: Dict[int, Set[str]] = {1: set(), 2: set()}
+        for consumer_node_id in [1, 2, 1, 1]:
+            task_ins = create_task_ins(
+                consumer_node_id=consumer_node_id, anonymous=False, run_id=run_id
+            )
+            task_ids[consumer_node_id].add(str(state.store_task_ins(task_ins)))
+
+        # Execute
+        first_batch = state.get_task_ins(node_id=1, limit=2)
+        second_batch = state.get_task_ins(node_id=1, limit=2)
+        third_batch = state.get_task_ins(node_id=1, limit=2)
+        other_node = state.get_task_ins(node_id=2, limit=None)
+
+        # Assert
+        assert len(first_batch) == 2
+        assert len(second_batch) == 1
+        assert len(third_batch) == 0
+        assert {t.task_id for t in first_batch + second_batch} == task_ids[1]
+        assert {t.task_id for t in other_node} == task_ids[2]
+
+    def test_wait_for_task_ins_with_pending_task_ins(self) -> None:
+        """Test that wait_for_task_ins returns right away for pending TaskIns."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        task_ins = create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+        state.store_task_ins(task_ins)
+
+        # Execute
+        start = time.monotonic()
+        state.wait_for_task_ins(node_id=1, timeout=5.0)
+        task_ins_list = state.get_task_ins(node_id=1, limit=None)
+
+        # Assert
+        assert time.monotonic() - start < 1.0
+        assert len(task_ins_list) == 1
+
     def test_task_ins_store_delivered_and_fail_retrieving(self) -> None:
         """Fail retrieving delivered task."""
         # Prepare
@@ -413,6 +456,25 @@ class StateTest(unittest.TestCase):
         # Assert
         self.assertSetEqual(actual_node_ids, set(node_ids[70:]))
 
+    def test_acknowledge_ping_after_node_went_offline(self) -> None:
+        """Test if a node that went offline is returned again after a ping."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        node_id = state.create_node()
+        state.acknowledge_ping(node_id, ping_interval=30)
+        current_time = time.time()
+        with patch("time.time", side_effect=lambda: current_time + 50):
+            assert not state.get_nodes(run_id)
+
+        # Execute
+        with patch("time.time", side_effect=lambda: current_time + 60):
+            state.acknowledge_ping(node_id, ping_interval=30)
+            actual_node_ids = state.get_nodes(run_id)
+
+        # Assert
+        self.assertSetEqual(actual_node_ids, {node_id})
+
 
 def create_task_ins(
     consumer_node_id: int,
@@ -477,6 +539,49 @@ class InMemoryStateTest(StateTest):
         """Return InMemoryState."""
         return InMemoryState()
 
+    def test_pending_task_ins_queues_are_released(self) -> None:
+        """Test that per-node queues are dropped when drained or deleted."""
+        # Prepare
+        state = InMemoryState()
+        run_id = state.create_run()
+        node_id_drained = state.create_node()
+        node_id_deleted = state.create_node()
+        for node_id in [node_id_drained, node_id_deleted]:
+            task_ins = create_task_ins(
+                consumer_node_id=node_id, anonymous=False, run_id=run_id
+            )
+            state.store_task_ins(task_ins)
+
+        # Execute
+        task_ins_list = state.get_task_ins(node_id=node_id_drained, limit=None)
+        state.delete_node(node_id_deleted)
+
+        # Assert
+        assert len(task_ins_list) == 1
+        assert not state.pending_by_node
+
+    def test_wait_for_task_ins_is_woken_up(self) -> None:
+        """Test that storing a TaskIns wakes up a waiting stream."""
+        # Prepare
+        state = InMemoryState()
+        run_id = state.create_run()
+        task_ins = create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+        waiter = threading.Thread(
+            target=state.wait_for_task_ins, kwargs={"node_id": 1, "timeout": 60.0}
+        )
+        waiter.start()
+        while not state.task_ins_waiters:
+            time.sleep(0.01)
+
+        # Execute
+        state.store_task_ins(task_ins)
+        waiter.join(timeout=10)
+
+        # Assert
+        assert not waiter.is_alive()
+        assert not state.task_ins_conditions
+        assert not state.task_ins_waiters
+
 
 class SqliteInMemoryStateTest(StateTest, unittest.TestCase):
     """Test SqliteState implemenation with in-memory database."""